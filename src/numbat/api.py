@@ -21,6 +21,8 @@ import logging
 import os
 import shutil
 import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
@@ -95,7 +97,12 @@ class SourcetrailDB:
             self.logger = logging.getLogger()
         else:
             self.logger = logger
-        self.name_cache = dict()
+        # Loaded from the database on the first node recorded
+        self.name_cache = None
+        # Serialized names of the nodes already recorded or looked up, by id
+        self.node_names = dict()
+        # Number of nested transaction() blocks currently running
+        self.__transactions = 0
 
     # ------------------------------------------------------------------------ #
     # Database file management functions                                       #
@@ -130,26 +137,34 @@ class SourcetrailDB:
         return path.exists()
 
     @classmethod
-    def open(cls, path: Path | str, clear: bool = False) -> "SourcetrailDB":
+    def open(
+        cls, path: Path | str, clear: bool = False, journal_mode: str = "WAL", synchronous: str = "NORMAL"
+    ) -> "SourcetrailDB":
         """
         This method allow to open an existing sourcetrail database
 
         :param path: The path to the existing database
         :param clear: If set to True the database is cleared (Optional)
+        :param journal_mode: The sqlite journal mode of the database (Optional)
+        :param synchronous: How often sqlite waits for the data to reach the disk,
+        use "FULL" for every commit to survive a power failure (Optional)
         :return: the SourcetrailDB object corresponding to the given DB
         """
         path = cls.__uniformize_path(path)
+        # Reject invalid values before touching the database file
+        SqliteHelper.check_pragma("journal_mode", journal_mode)
+        SqliteHelper.check_pragma("synchronous", synchronous)
         if not path.exists():
             if path.is_file() or not clear:
                 raise FileNotFoundError("%s not found" % str(path))
-            return cls.create(path)
+            return cls.create(path, journal_mode, synchronous)
 
         if clear:
             path.unlink(missing_ok=True)
-            return cls.create(path)
+            return cls.create(path, journal_mode, synchronous)
 
         try:
-            database = SqliteHelper.connect(str(path))
+            database = SqliteHelper.connect(str(path), journal_mode=journal_mode, synchronous=synchronous)
         except Exception as e:
             raise NumbatException(*e.args)
 
@@ -158,19 +173,25 @@ class SourcetrailDB:
         return obj
 
     @classmethod
-    def create(cls, path: Path | str) -> "SourcetrailDB":
+    def create(cls, path: Path | str, journal_mode: str = "WAL", synchronous: str = "NORMAL") -> "SourcetrailDB":
         """
         This method allow to create a sourcetrail database
 
         :param path: The path to the new database
+        :param journal_mode: The sqlite journal mode of the database (Optional)
+        :param synchronous: How often sqlite waits for the data to reach the disk,
+        use "FULL" for every commit to survive a power failure (Optional)
         :return: the SourcetrailDB object corresponding to the given DB path
         """
         path = cls.__uniformize_path(path)
+        # Reject invalid values before touching the database file
+        SqliteHelper.check_pragma("journal_mode", journal_mode)
+        SqliteHelper.check_pragma("synchronous", synchronous)
         if path.exists():
             raise FileExistsError("%s already exists" % str(path))
 
         try:
-            database = SqliteHelper.connect(str(path))
+            database = SqliteHelper.connect(str(path), journal_mode=journal_mode, synchronous=synchronous)
         except Exception as e:
             raise NumbatException(*e.args)
 
@@ -178,8 +199,7 @@ class SourcetrailDB:
         try:
             obj.__create_sql_tables()
             # add metadata in db
-            MetaDAO.new(obj.database, "storage_version", "25")
-            MetaDAO.new(obj.database, "project_settings", obj.SOURCETRAIL_XML)
+            MetaDAO.new_many(obj.database, (("storage_version", "25"), ("project_settings", obj.SOURCETRAIL_XML)))
             # Create Sourcetrail Project file
             project_file = obj.path.with_suffix(cls.SOURCETRAIL_PROJECT_EXT)
             project_file.write_text(cls.SOURCETRAIL_XML)
@@ -203,21 +223,7 @@ class SourcetrailDB:
 
         :return: None
         """
-        ElementDAO.create_table(self.database)
-        ElementComponentDAO.create_table(self.database)
-        EdgeDAO.create_table(self.database)
-        NodeDAO.create_table(self.database)
-        NodeTypeDAO.create_table(self.database)
-        SymbolDAO.create_table(self.database)
-        FileDAO.create_table(self.database)
-        FileContentDAO.create_table(self.database)
-        NodeFileDAO.create_table(self.database)
-        LocalSymbolDAO.create_table(self.database)
-        SourceLocationDAO.create_table(self.database)
-        OccurrenceDAO.create_table(self.database)
-        ComponentAccessDAO.create_table(self.database)
-        ErrorDAO.create_table(self.database)
-        MetaDAO.create_table(self.database)
+        SqliteHelper.init_schema(self.database)
 
     def commit(self) -> None:
         """
@@ -232,6 +238,37 @@ class SourcetrailDB:
         else:
             raise NoDatabaseOpen()
 
+    @contextmanager
+    def transaction(self) -> Iterator["SourcetrailDB"]:
+        """
+        Group the changes made inside the `with` block in a single
+        transaction, committed when the block exits or rolled back if it
+        raises. Recording many symbols this way pays for a single commit.
+        The changes made before the outermost block and not committed yet
+        are committed when it starts, so that they are not mixed with the
+        ones of the block. Blocks can be nested, an inner block failing
+        only rolls back its own changes.
+
+        :return: The SourcetrailDB object itself
+        """
+        if not self.database:
+            raise NoDatabaseOpen()
+        if not self.__transactions and self.database.in_transaction:
+            # Otherwise the block would only be a savepoint of the pending
+            # transaction and nothing would be committed when it exits
+            self.database.commit()
+        self.__transactions += 1
+        try:
+            with SqliteHelper.transaction(self.database):
+                yield self
+        except BaseException:
+            # The cached nodes may have been inserted by the rolled back changes
+            self.name_cache = None
+            self.node_names.clear()
+            raise
+        finally:
+            self.__transactions -= 1
+
     def clear(self) -> None:
         """
         Clear all elements present in the database.
@@ -254,6 +291,8 @@ class SourcetrailDB:
         OccurrenceDAO.clear(self.database)
         ComponentAccessDAO.clear(self.database)
         ErrorDAO.clear(self.database)
+        self.name_cache = dict()
+        self.node_names.clear()
 
     def close(self) -> None:
         """
@@ -264,8 +303,15 @@ class SourcetrailDB:
         :return: None
         """
         if self.database:
-            self.database.close()
-            self.database = None
+            try:
+                SqliteHelper.finalize(self.database, analyze=False)
+            except sqlite3.Error as e:
+                # Refreshing the statistics is best effort, it fails when the
+                # database is busy or read-only but the data is already there
+                self.logger.warning("Cannot optimize %s before closing it: %s", self.path, e)
+            finally:
+                self.database.close()
+                self.database = None
         else:
             raise NoDatabaseOpen()
 
@@ -287,16 +333,17 @@ class SourcetrailDB:
                  the existing one
         """
 
-        if name not in self.name_cache:
-            elem = Element()
-            elem.id = ElementDAO.new(self.database, elem)
+        cache = self.name_cache
+        if cache is None:
+            # The nodes recorded before the database was opened must be
+            # known too, or they would be inserted a second time
+            cache = self.name_cache = NodeDAO.ids_by_name(self.database)
 
-            NodeDAO.new(self.database, Node(elem.id, type_, name, hover_display))
-
-            self.name_cache[name] = elem.id
-            return elem.id
-        else:
-            return self.name_cache[name]
+        node_id = cache.get(name)
+        if node_id is None:
+            node_id = cache[name] = NodeDAO.new_atomic(self.database, Node(0, type_, name, hover_display))
+            self.node_names[node_id] = name
+        return node_id
 
     def _record_symbol(self, hierarchy: NameHierarchy, hover_display: str) -> int:
         """
@@ -307,24 +354,18 @@ class SourcetrailDB:
         :return: An unique integer that identify the inserted element
         """
 
-        ids = []
-
         # Add all the nodes needed
-        for i in range(0, hierarchy.size()):
-            ids.append(
-                self.__add_if_not_existing(hierarchy.serialize_range(0, i + 1), NodeType.NODE_SYMBOL, hover_display)
-            )
+        add_if_not_existing = self.__add_if_not_existing
+        ids = [
+            add_if_not_existing(name, NodeType.NODE_SYMBOL, hover_display) for name in hierarchy.serialize_prefixes()
+        ]
 
         # Add all the edges between nodes
-        if len(ids) > 1:
-            for i in range(1, len(ids)):
-                parent, child = ids[i - 1], ids[i]
-                elem = Element()
-                elem.id = ElementDAO.new(self.database, elem)
+        database = self.database
+        for parent, child in zip(ids, ids[1:]):
+            EdgeDAO.new_atomic(database, Edge(0, EdgeType.MEMBER, parent, child))
 
-                EdgeDAO.new(self.database, Edge(elem.id, EdgeType.MEMBER, parent, child))
-
-                # Return the id of the last inserted elements
+        # Return the id of the last inserted elements
         return ids[-1]
 
     def _get_symbol(self, hierarchy: NameHierarchy) -> int | None:
@@ -412,10 +453,13 @@ class SourcetrailDB:
         """
         name_element = NameElement(prefix, name, postfix)
         if parent_id:
-            node = NodeDAO.get(self.database, parent_id)
-            if not node:
-                return
-            hierarchy = NameHierarchy.deserialize_name(node.name)
+            parent_name = self.node_names.get(parent_id)
+            if parent_name is None:
+                node = NodeDAO.get(self.database, parent_id)
+                if not node:
+                    return
+                parent_name = self.node_names[parent_id] = node.name
+            hierarchy = NameHierarchy.deserialize_name(parent_name)
             hierarchy.extend(name_element)
             obj_id = self._record_symbol(hierarchy, hover_display)
         else:
@@ -1218,12 +1262,7 @@ class SourcetrailDB:
         :return: None
         """
 
-        elem = Element()
-        elem.id = ElementDAO.new(self.database, elem)
-
-        EdgeDAO.new(self.database, Edge(elem.id, type_, source_id, dest_id, hover_display))
-
-        return elem.id
+        return EdgeDAO.new_atomic(self.database, Edge(0, type_, source_id, dest_id, hover_display))
 
     def record_ref_member(self, source_id: int, dest_id: int, hover_display: str = "") -> int:
         """
@@ -1400,11 +1439,8 @@ class SourcetrailDB:
         unsolved_symbol_id = self._record_symbol(hierarchy, "")
 
         # Add a new edge
-        elem = Element()
-        elem.id = ElementDAO.new(self.database, elem)
-
-        reference_id = EdgeDAO.new(
-            self.database, Edge(elem.id, reference_type, symbol_id, unsolved_symbol_id, hover_display)
+        reference_id = EdgeDAO.new_atomic(
+            self.database, Edge(0, reference_type, symbol_id, unsolved_symbol_id, hover_display)
         )
 
         # Add the new source location
@@ -14,7 +14,14 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import array
+import json
+import pathlib
 import sqlite3
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import Generic, TypeVar
 
 from .types import (
     Element,
@@ -44,23 +51,214 @@ from .types import (
 # Data Access Object (DAO) for Sourcetrail database                        #
 # ------------------------------------------------------------------------ #
 
+# Value to member lookup tables of the enums stored in the database. Indexing
+# them directly skips the checks done by Enum.__call__ on every decoded row.
+_COMPONENT_ACCESS_TYPES = ComponentAccessType._value2member_map_
+_ELEMENT_COMPONENT_TYPES = ElementComponentType._value2member_map_
+_EDGE_TYPES = EdgeType._value2member_map_
+_NODE_TYPES = NodeType._value2member_map_
+_SOURCE_LOCATION_TYPES = SourceLocationType._value2member_map_
+_SYMBOL_TYPES = SymbolType._value2member_map_
+
+# Type of the objects manipulated by a TableDAO
+_T = TypeVar("_T")
+
+# RETURNING clauses only exist since SQLite 3.35, older versions go through
+# the last row id of the cursor instead
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+class Connection(sqlite3.Connection):
+    """
+    sqlite3 connection returned by SqliteHelper.connect. On top of the
+    standard connection, it holds the cursors reused by the DAO hot paths
+    and the local symbols already resolved by name, so they live and die
+    with the connection itself.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.cursors = dict()
+        self.local_symbols = dict()
+
+    def rollback(self) -> None:
+        super().rollback()
+        # The cached local symbols may have been inserted by the rolled back
+        # transaction, so they can't be trusted anymore
+        self.local_symbols.clear()
+
+    def close(self) -> None:
+        # Release the statements prepared by the cached cursors along with
+        # the connection rather than whenever the cursors are collected
+        for cur in self.cursors.values():
+            cur.close()
+        self.cursors.clear()
+        self.local_symbols.clear()
+        super().close()
+
+
+# Values accepted by the PRAGMAs set from the caller arguments, PRAGMA
+# values can't be bound as parameters so they are formatted in the request
+_PRAGMA_VALUES = {
+    "journal_mode": frozenset(("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")),
+    "synchronous": frozenset(("OFF", "NORMAL", "FULL", "EXTRA", "0", "1", "2", "3")),
+    "temp_store": frozenset(("DEFAULT", "FILE", "MEMORY", "0", "1", "2")),
+}
+
+# Secondary indexes of the database, the automatic ones backing primary
+# keys have no SQL and can't be dropped
+_SQL_INDEX_LIST = """
+SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL;"""
+
 
 class SqliteHelper(object):
     """
     Helper class for sqlite operation
+
+    Apart from `transaction()`, none of the helpers (and thus none of the
+    DAO methods but `OccurrenceDAO.new_bulk`) commit the requests they
+    execute, the caller decides when the changes are committed, either
+    with the connection commit method or by grouping the requests with
+    `transaction()`.
     """
 
     @staticmethod
-    def connect(path: str) -> sqlite3.Connection:
+    def connect(
+        path: str,
+        check_same_thread: bool = True,
+        cached_statements: int = 256,
+        read_only: bool = False,
+        journal_mode: str = "WAL",
+        synchronous: str = "NORMAL",
+    ) -> sqlite3.Connection:
         """
         Wrapper for sqlite3 connect method so the api doesn't rely
         directly on sqlite and his more general
         :param path: The path to the database, if the path doesn't point
         to an existing file, a new database file will be created
+        :param check_same_thread: If set to False, the connection can be
+        used (and closed) from another thread than the one that created it
+        :param cached_statements: The number of prepared statements kept by
+        sqlite3, large enough to hold every request of the DAOs
+        :param read_only: If set to True, the existing database is opened
+        in read-only mode, any write through the connection fails
+        :param journal_mode: The journal mode of the database, see
+        `configure()`
+        :param synchronous: How often sqlite waits for the data to reach
+        the disk, see `configure()`
         :return: A connection handle that can be used for future
         operation on the database
         """
-        return sqlite3.connect(path)
+        # Fail before creating the database file or leaking the connection
+        SqliteHelper.check_pragma("journal_mode", journal_mode)
+        SqliteHelper.check_pragma("synchronous", synchronous)
+        if read_only:
+            path = pathlib.Path(path).absolute().as_uri() + "?mode=ro"
+        database = sqlite3.connect(
+            path,
+            check_same_thread=check_same_thread,
+            cached_statements=cached_statements,
+            factory=Connection,
+            uri=read_only,
+        )
+        SqliteHelper.configure(database, journal_mode, synchronous)
+        return database
+
+    @staticmethod
+    def configure(
+        database: sqlite3.Connection,
+        journal_mode: str = "WAL",
+        synchronous: str = "NORMAL",
+        cache_size: int = -65536,
+        temp_store: str = "MEMORY",
+        mmap_size: int = 268435456,
+    ) -> None:
+        """
+        Tune the connection for the indexing workload: the write-ahead log
+        with synchronous=NORMAL only syncs on checkpoints instead of on
+        every commit and lets readers run while a write is in progress,
+        while the larger page cache and memory mapping keep the hot tables
+        resident.
+        :param database: A database handle
+        :param journal_mode: The journal mode of the database, it is
+        persistent and ignored for in-memory databases
+        :param synchronous: How often sqlite waits for the data to reach
+        the disk, with NORMAL in WAL mode the last commits may be lost on a
+        power failure but the database stays consistent, FULL makes every
+        commit durable at the cost of a sync each time
+        :param cache_size: The size of the page cache, in pages if
+        positive or in KiB if negative
+        :param temp_store: Where the temporary tables and indices are kept
+        :param mmap_size: The maximum number of bytes of the database file
+        accessed through memory mapping
+        :return: None
+        """
+
+        if not database:
+            raise Exception("Invalid database handle")
+
+        journal_mode = SqliteHelper.check_pragma("journal_mode", journal_mode)
+        synchronous = SqliteHelper.check_pragma("synchronous", synchronous)
+        temp_store = SqliteHelper.check_pragma("temp_store", temp_store)
+
+        try:
+            database.execute("PRAGMA journal_mode=%s;" % journal_mode)
+        except sqlite3.OperationalError:
+            # Switching the journal mode writes to the database file, which
+            # read-only connections can't do, they keep the current mode
+            pass
+        database.execute("PRAGMA synchronous=%s;" % synchronous)
+        database.execute("PRAGMA cache_size=%d;" % cache_size)
+        database.execute("PRAGMA temp_store=%s;" % temp_store)
+        database.execute("PRAGMA mmap_size=%d;" % mmap_size)
+
+    @staticmethod
+    def check_pragma(pragma: str, value: str | int) -> str:
+        """
+        Check that the value is accepted by the PRAGMA before it is
+        formatted in a request.
+        :param pragma: The name of the PRAGMA, one of journal_mode,
+        synchronous or temp_store
+        :param value: The value to check, the keywords are case insensitive
+        :return: The value, as it can be formatted in the request
+        """
+        keyword = str(value).upper()
+        if keyword not in _PRAGMA_VALUES[pragma]:
+            raise ValueError("Invalid %s: %r" % (pragma, value))
+        return keyword
+
+    @staticmethod
+    def cursor(database: sqlite3.Connection, key: str) -> sqlite3.Cursor:
+        """
+        Return the cursor associated to the given key on this connection,
+        creating it the first time. Reusing the same cursor for a request
+        executed over and over avoids allocating a new one on every call.
+        The generic exec and fetch helpers use the SQL text itself as key,
+        which keeps the number of cursors bounded since all the requests
+        are module constants. They look the cursor up directly in the
+        connection cache and only call this method when it misses, saving
+        a call on every request.
+        Connections that were not opened with SqliteHelper.connect get a
+        new cursor each time. An invalid database handle always misses the
+        cache, so the helpers leave its check to this method rather than
+        testing the handle on every request.
+        :param database: A database handle
+        :param key: The identifier of the cursor, usually the table and
+        the operation it is used for
+        :return: A cursor on the database
+        """
+
+        if not database:
+            raise Exception("Invalid database handle")
+
+        cursors = getattr(database, "cursors", None)
+        if cursors is None:
+            return database.cursor()
+
+        cur = cursors.get(key)
+        if cur is None:
+            cur = cursors[key] = database.cursor()
+        return cur
 
     @staticmethod
     def exec(database: sqlite3.Connection, request: str, parameters: tuple = ()) -> int:
@@ -72,15 +270,50 @@ class SqliteHelper(object):
         parameters of the SQL request (if any)
         :return: The id of the last modified row (useful in case insertion)
         """
-
-        if not database:
-            raise Exception("Invalid database handle")
-
-        cur = database.cursor()
+        try:
+            cur = database.cursors[request]
+        except (AttributeError, KeyError):
+            cur = SqliteHelper.cursor(database, request)
         cur.execute(request, parameters)
-        cur.close()
         return cur.lastrowid
 
+    @staticmethod
+    def exec_returning(database: sqlite3.Connection, request: str, parameters: tuple = ()) -> int:
+        """
+        Execute a sqlite request ending with a RETURNING clause and return
+        the first column of its first row, usually the id of the inserted
+        row, without a separate lookup of the last row id
+        :param database: A database handle
+        :param request: The SQL request to execute
+        :param parameters: A tuple containing values for the bind
+        parameters of the SQL request (if any)
+        :return: The value returned by the request
+        """
+        try:
+            cur = database.cursors[request]
+        except (AttributeError, KeyError):
+            cur = SqliteHelper.cursor(database, request)
+        cur.execute(request, parameters)
+        return cur.fetchone()[0]
+
+    @staticmethod
+    def exec_many(database: sqlite3.Connection, request: str, parameters: Iterable) -> int:
+        """
+        Execute the sqlite request once for each set of bind parameters
+        without returning the result
+        :param database: A database handle
+        :param request: The SQL request to execute
+        :param parameters: An iterable of tuples containing values for the
+        bind parameters of the SQL request
+        :return: The number of modified rows
+        """
+        try:
+            cur = database.cursors[request]
+        except (AttributeError, KeyError):
+            cur = SqliteHelper.cursor(database, request)
+        cur.executemany(request, parameters)
+        return cur.rowcount
+
     @staticmethod
     def fetch(database: sqlite3.Connection, request: str, parameters: tuple = ()) -> list:
         """
@@ -91,16 +324,511 @@ class SqliteHelper(object):
         parameters of the SQL request (if any)
         :return: A list containing the results of the SQL request
         """
+        try:
+            cur = database.cursors[request]
+        except (AttributeError, KeyError):
+            cur = SqliteHelper.cursor(database, request)
+        cur.execute(request, parameters)
+        return cur.fetchall()
+
+    @staticmethod
+    def fetch_one(database: sqlite3.Connection, request: str, parameters: tuple = ()) -> tuple | None:
+        """
+        Return the first row of the result of the sqlite request, without
+        building the list of all the rows
+        :param database: A database handle
+        :param request: The SQL request to execute
+        :param parameters: A tuple containing values for the bind
+        parameters of the SQL request (if any)
+        :return: The first row of the result, None if there is none
+        """
+        try:
+            cur = database.cursors[request]
+        except (AttributeError, KeyError):
+            cur = SqliteHelper.cursor(database, request)
+        cur.execute(request, parameters)
+        return cur.fetchone()
+
+    @staticmethod
+    def fetch_batches(
+        database: sqlite3.Connection, request: str, parameters: tuple = (), size: int = 1024
+    ) -> Iterator[list]:
+        """
+        Return the result of the sqlite request as successive lists of
+        at most `size` rows, so large tables can be walked without holding
+        the whole result set in memory
+        :param database: A database handle
+        :param request: The SQL request to execute
+        :param parameters: A tuple containing values for the bind
+        parameters of the SQL request (if any)
+        :param size: The maximum number of rows in each batch
+        :return: An iterator over the batches of rows
+        """
 
         if not database:
             raise Exception("Invalid database handle")
 
         cur = database.cursor()
         cur.execute(request, parameters)
-        result = cur.fetchall()
-        cur.close()
+        try:
+            rows = cur.fetchmany(size)
+            while rows:
+                yield rows
+                rows = cur.fetchmany(size)
+        finally:
+            cur.close()
+
+    @staticmethod
+    @contextmanager
+    def transaction(database: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+        """
+        Run the requests executed inside the `with` block in a single
+        transaction, committed when the block exits or rolled back if it
+        raises. Grouping bulk operations this way avoids paying for one
+        journal commit per request. If a transaction is already open on
+        the connection, the block runs inside a savepoint instead, so
+        transactions can be nested.
+        :param database: A database handle
+        :return: The database handle
+        """
+
+        if not database:
+            raise Exception("Invalid database handle")
+
+        if database.in_transaction:
+            database.execute("SAVEPOINT numbat_transaction;")
+            try:
+                yield database
+            except BaseException:
+                database.execute("ROLLBACK TO numbat_transaction;")
+                database.execute("RELEASE numbat_transaction;")
+                LocalSymbolDAO.names(database).clear()
+                raise
+            database.execute("RELEASE numbat_transaction;")
+        else:
+            database.execute("BEGIN IMMEDIATE;")
+            # If the caller enforces the foreign keys, check them once at
+            # commit rather than on each request, sqlite resets it at commit
+            database.execute("PRAGMA defer_foreign_keys=ON;")
+            try:
+                yield database
+                database.commit()
+            except BaseException:
+                database.rollback()
+                raise
+
+    @staticmethod
+    @contextmanager
+    def bulk_mode(database: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+        """
+        Drop the secondary indexes of the database while the `with` block
+        runs and build them again when it exits. Building an index over a
+        full table once is much cheaper than updating it for each inserted
+        row, this is meant for large initial loads. The lookups relying on
+        these indexes, such as LocalSymbolDAO.get_from_name, scan their
+        table inside the block.
+        :param database: A database handle
+        :return: The database handle
+        """
+
+        if not database:
+            raise Exception("Invalid database handle")
+
+        indexes = SqliteHelper.fetch(database, _SQL_INDEX_LIST)
+        for name, _ in indexes:
+            database.execute('DROP INDEX "%s";' % name.replace('"', '""'))
+        try:
+            yield database
+        finally:
+            for _, sql in indexes:
+                database.execute(sql)
+
+    @staticmethod
+    def finalize(database: sqlite3.Connection, analyze: bool = True) -> None:
+        """
+        Refresh the statistics used by the sqlite query planner, so that
+        the lookups on the indexed columns pick the index rather than a
+        full scan. Gathering the statistics of every table is meant to be
+        done once, after a large load.
+        :param database: A database handle
+        :param analyze: If set to False, only the tables whose statistics
+        are missing or outdated are analyzed, which is cheap enough to be
+        done each time the database is closed
+        :return: None
+        """
+
+        if not database:
+            raise Exception("Invalid database handle")
+
+        if analyze:
+            database.execute("ANALYZE;")
+        database.execute("PRAGMA optimize;")
+
+    @staticmethod
+    def pool(path: str, size: int = 8) -> "SqlitePool":
+        """
+        Create a pool of connections on the database, so that a
+        multi-threaded indexer or a long running service reuses open and
+        configured connections instead of reopening the database for each
+        unit of work.
+        :param path: The path to the database
+        :param size: The maximum number of idle connections kept open
+        :return: A SqlitePool on the database
+        """
+        return SqlitePool(path, size)
+
+    @staticmethod
+    def init_schema(database: sqlite3.Connection) -> None:
+        """
+        Create all the tables of the Sourcetrail database in a single
+        script, instead of one request per table
+        :param database: A database handle
+        :return: None
+        """
+
+        if not database:
+            raise Exception("Invalid database handle")
+
+        database.executescript(_SQL_SCHEMA)
+
+
+class SqlitePool(object):
+    """
+    Small pool of sqlite connections for multi-threaded indexers.
+
+    A sqlite3 connection should not be shared between threads, so each
+    thread obtains its own reader connection with `get()` (or borrows
+    one for a `with` block with `acquire()`), while all the writes go
+    through a single dedicated connection obtained with `writer()`.
+    The returned connections are regular sqlite3 connections that can be
+    given to any DAO method, the reader connections being opened in
+    read-only mode.
+    """
+
+    def __init__(self, path: str, size: int = 4) -> None:
+        """
+        Create a new pool, connections are opened lazily.
+        :param path: The path to the database
+        :param size: The maximum number of idle reader connections kept
+        open for reuse
+        """
+        self.path = path
+        self.size = size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._idle = []
+        self._connections = []
+        self._writer = None
+        self._writer_lock = threading.RLock()
+
+    def _open(self, read_only: bool = True) -> sqlite3.Connection:
+        """
+        Open a new connection on the pooled database and keep track of it
+        so it can be closed along with the pool.
+        :param read_only: Whether the connection is a read-only reader
+        connection
+        :return: A connection handle
+        """
+        connection = SqliteHelper.connect(self.path, check_same_thread=False, read_only=read_only)
+        with self._lock:
+            self._connections.append(connection)
+        return connection
+
+    def _take(self) -> sqlite3.Connection:
+        """
+        Take an idle connection out of the pool, or open a new one if
+        there is none.
+        :return: A connection handle
+        """
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._open()
+
+    def _give(self, connection: sqlite3.Connection) -> None:
+        """
+        Put a connection back in the pool. The connection is kept open for
+        reuse if there are less than `size` idle connections, otherwise it
+        is closed.
+        :param connection: The connection to give back
+        :return: None
+        """
+        # End any transaction left open by the previous user
+        connection.rollback()
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(connection)
+                return
+            self._connections.remove(connection)
+        connection.close()
+
+    def get(self) -> sqlite3.Connection:
+        """
+        Return the reader connection of the calling thread, reusing an idle
+        connection of the pool or opening a new one the first time.
+        :return: A connection handle
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._take()
+        return connection
+
+    def release(self) -> None:
+        """
+        Give the reader connection of the calling thread back to the pool.
+        :return: None
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            return
+        del self._local.connection
+        self._give(connection)
+
+    @contextmanager
+    def acquire(self) -> Iterator[sqlite3.Connection]:
+        """
+        Context manager lending a connection of the pool for the duration
+        of the block, independently of the thread-local one returned by
+        `get()`. The connection goes back to the pool when leaving the
+        block, so its statement cache stays warm for the next user.
+        :return: A connection handle
+        """
+        connection = self._take()
+        try:
+            yield connection
+        finally:
+            self._give(connection)
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """
+        Context manager giving an exclusive access to the writer connection
+        of the pool. The changes are committed when leaving the block, or
+        rolled back if an exception is raised.
+        :return: The writer connection handle
+        """
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = self._open(read_only=False)
+            try:
+                yield self._writer
+            except BaseException:
+                self._writer.rollback()
+                raise
+            self._writer.commit()
+
+    def close(self) -> None:
+        """
+        Close every connection opened by the pool, uncommitted changes
+        of the writer connection are lost.
+        :return: None
+        """
+        with self._writer_lock, self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+            self._idle.clear()
+            self._writer = None
+        self._local = threading.local()
 
-        return result
+
+class TableDAO(Generic[_T]):
+    """
+    Base class of the DAOs of the tables holding a single kind of object
+    whose key is the first column. Subclasses give the requests of their
+    table and the conversion of their objects to and from rows, the
+    methods manipulating the table are shared by all of them.
+
+    The conversions are two static methods every subclass must define,
+    a subclass missing one of them is rejected when it is defined:
+      - `_to_row(obj) -> tuple` returns the values of the columns of the
+        table storing the object, key first
+      - `_from_row(row) -> object` returns the object stored by a row
+
+    Like the SqliteHelper methods they rely on, none of them commit:
+    loops of calls should be grouped with `SqliteHelper.transaction()`.
+    """
+
+    _SQL_CREATE: str
+    _SQL_DROP: str
+    _SQL_INSERT: str
+    _SQL_DELETE: str
+    _SQL_DELETE_MANY: str
+    _SQL_CLEAR: str
+    _SQL_COUNT: str
+    _SQL_GET: str
+    _SQL_UPDATE: str
+    _SQL_LIST: str
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        for hook in ("_to_row", "_from_row"):
+            if not callable(getattr(cls, hook, None)):
+                raise TypeError("%s must define the static method %s" % (cls.__name__, hook))
+
+    @classmethod
+    def create_table(cls, database: sqlite3.Connection) -> None:
+        """
+        Create the table of the Sourcetrail database
+        if it doesn't exist.
+        :param database: A database handle
+        :return: None
+        """
+        SqliteHelper.exec(database, cls._SQL_CREATE)
+
+    @classmethod
+    def delete_table(cls, database: sqlite3.Connection) -> None:
+        """
+        Delete the table of the Sourcetrail database
+        only if it exists.
+        :param database: A database handle
+        :return: None
+        """
+        SqliteHelper.exec(database, cls._SQL_DROP)
+
+    @classmethod
+    def new(cls, database: sqlite3.Connection, obj: _T) -> int:
+        """
+        Insert a new object inside the table.
+        :param database: A database handle
+        :param obj: The object to insert
+        :return: The id of the inserted row
+        """
+        return SqliteHelper.exec(database, cls._SQL_INSERT, cls._to_row(obj))
+
+    @classmethod
+    def new_many(cls, database: sqlite3.Connection, objs: Iterable[_T]) -> int:
+        """
+        Insert many objects inside the table with a single request.
+        :param database: A database handle
+        :param objs: The objects to insert
+        :return: The number of inserted rows
+        """
+        return SqliteHelper.exec_many(database, cls._SQL_INSERT, map(cls._to_row, objs))
+
+    @classmethod
+    def delete(cls, database: sqlite3.Connection, obj: _T) -> None:
+        """
+        Delete an object from the table.
+        :param database: A database handle
+        :param obj: The object to delete
+        :return: None
+        """
+        SqliteHelper.exec(database, cls._SQL_DELETE, cls._to_row(obj)[:1])
+
+    @classmethod
+    def delete_many(cls, database: sqlite3.Connection, elem_ids: Iterable[int]) -> None:
+        """
+        Delete the objects matching the given ids from the table with a
+        single request, whatever the number of ids. The ids are bound as
+        one JSON array so the request text stays the same.
+        :param database: A database handle
+        :param elem_ids: The ids of the objects to delete
+        :return: None
+        """
+        SqliteHelper.exec(database, cls._SQL_DELETE_MANY, (json.dumps(list(elem_ids)),))
+
+    @classmethod
+    def clear(cls, database: sqlite3.Connection) -> None:
+        """
+        Delete all the objects from the table.
+        :param database: A database handle
+        :return: None
+        """
+        SqliteHelper.exec(database, cls._SQL_CLEAR)
+
+    @classmethod
+    def count(cls, database: sqlite3.Connection) -> int:
+        """
+        Return the number of objects in the table, counted by sqlite without reading
+        the rows into Python objects. sqlite doesn't keep the count, so
+        it still walks the whole table.
+        :param database: A database handle
+        :return: The number of objects
+        """
+        return SqliteHelper.fetch_one(database, cls._SQL_COUNT)[0]
+
+    @classmethod
+    def get(cls, database: sqlite3.Connection, elem_id: int) -> _T:
+        """
+        Return an object from the database with the matching id
+        :param database: A database handle
+        :param elem_id: The id of the object to retrieve
+        :return: An object that reflect the content inside
+        the database
+        """
+        row = SqliteHelper.fetch_one(database, cls._SQL_GET, (elem_id,))
+        if row:
+            return cls._from_row(row)
+
+    @classmethod
+    def update(cls, database: sqlite3.Connection, obj: _T) -> None:
+        """
+        Update an object inside the table.
+        :param database: A database handle
+        :param obj: The object to update
+        :return: None
+        """
+        row = cls._to_row(obj)
+        SqliteHelper.exec(database, cls._SQL_UPDATE, row[1:] + row[:1])
+
+    @classmethod
+    def update_many(cls, database: sqlite3.Connection, objs: Iterable[_T]) -> int:
+        """
+        Update many objects inside the table with a single request.
+        :param database: A database handle
+        :param objs: The objects to update
+        :return: The number of updated rows
+        """
+        return SqliteHelper.exec_many(database, cls._SQL_UPDATE, (row[1:] + row[:1] for row in map(cls._to_row, objs)))
+
+    @classmethod
+    def iter(cls, database: sqlite3.Connection) -> Iterator[_T]:
+        """
+        Iterate over all the objects from the table.
+        The rows are read from the database as the iteration goes, so
+        the whole table is never held in memory.
+        :param database: A database handle
+        :return: An iterator over the objects
+        """
+        for rows in SqliteHelper.fetch_batches(database, cls._SQL_LIST):
+            yield from map(cls._from_row, rows)
+
+    @classmethod
+    def list(cls, database: sqlite3.Connection) -> list[_T]:
+        """
+        Return the list of all the objects from the table.
+        :param database: A database handle
+        :return: The list of objects
+        """
+        return list(map(cls._from_row, SqliteHelper.fetch(database, cls._SQL_LIST)))
+
+
+_SQL_ELEMENT_CREATE = """
+CREATE TABLE IF NOT EXISTS element(
+    id INTEGER,
+    PRIMARY KEY(id));"""
+
+_SQL_ELEMENT_DROP = """
+DROP TABLE IF EXISTS element;"""
+
+_SQL_ELEMENT_INSERT = """
+INSERT INTO element(id) VALUES (NULL);"""
+
+_SQL_ELEMENT_DELETE = """
+DELETE FROM element WHERE id = ?;"""
+
+_SQL_ELEMENT_DELETE_MANY = """
+DELETE FROM element WHERE id IN (SELECT value FROM json_each(?));"""
+
+_SQL_ELEMENT_CLEAR = """
+DELETE FROM element;"""
+
+_SQL_ELEMENT_GET = """
+SELECT id FROM element WHERE id = ?;"""
+
+_SQL_ELEMENT_LIST = """
+SELECT id FROM element;"""
 
 
 class ElementDAO(object):
@@ -117,13 +845,7 @@ class ElementDAO(object):
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """    
-            CREATE TABLE IF NOT EXISTS element(
-                id INTEGER,                         
-                PRIMARY KEY(id));""",
-        )
+        SqliteHelper.exec(database, _SQL_ELEMENT_CREATE)
 
     @staticmethod
     def delete_table(database: sqlite3.Connection) -> None:
@@ -133,11 +855,7 @@ class ElementDAO(object):
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DROP TABLE IF EXISTS main.element;""",
-        )
+        SqliteHelper.exec(database, _SQL_ELEMENT_DROP)
 
     @staticmethod
     def new(database: sqlite3.Connection, obj: Element) -> int:
@@ -152,11 +870,19 @@ class ElementDAO(object):
         # NULL and the database does the rest.
         # The 'obj' parameter is present to add some consistency with the
         # rest of the API and also for futur proof consideration.
-        return SqliteHelper.exec(
-            database,
-            """
-            INSERT INTO element(id) VALUES (NULL);""",
-        )
+        return SqliteHelper.exec(database, _SQL_ELEMENT_INSERT)
+
+    @staticmethod
+    def new_many(database: sqlite3.Connection, objs: Iterable[Element]) -> int:
+        """
+        Insert as many new Elements inside the element table as given
+        objects with a single request.
+        :param database: A database handle
+        :param objs: The objects to insert, only their number matters
+        :return: The number of inserted elements
+        """
+        # As for 'new', the identifiers are chosen by the database
+        return SqliteHelper.exec_many(database, _SQL_ELEMENT_INSERT, (() for _ in objs))
 
     @staticmethod
     def delete(database: sqlite3.Connection, obj: Element) -> None:
@@ -166,12 +892,18 @@ class ElementDAO(object):
         :param obj: The object to delete
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM element WHERE id = ?;""",
-            (obj.id,),
-        )
+        SqliteHelper.exec(database, _SQL_ELEMENT_DELETE, (obj.id,))
+
+    @staticmethod
+    def delete_many(database: sqlite3.Connection, elem_ids: Iterable[int]) -> None:
+        """
+        Delete the Elements matching the given ids from the element table with a
+        single request, whatever the number of ids.
+        :param database: A database handle
+        :param elem_ids: The ids of the elements to delete
+        :return: None
+        """
+        SqliteHelper.exec(database, _SQL_ELEMENT_DELETE_MANY, (json.dumps(list(elem_ids)),))
 
     @staticmethod
     def clear(database: sqlite3.Connection) -> None:
@@ -180,11 +912,7 @@ class ElementDAO(object):
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM element;""",
-        )
+        SqliteHelper.exec(database, _SQL_ELEMENT_CLEAR)
 
     @staticmethod
     def get(database: sqlite3.Connection, elem_id: int) -> Element:
@@ -195,15 +923,9 @@ class ElementDAO(object):
         :return: A Element object that reflect the content inside
         the database
         """
-        out = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM element WHERE id = ?;""",
-            (elem_id,),
-        )
-
-        if len(out) == 1:
-            return Element(*out[0])
+        row = SqliteHelper.fetch_one(database, _SQL_ELEMENT_GET, (elem_id,))
+        if row:
+            return Element(*row)
 
     @staticmethod
     def update(database: sqlite3.Connection, obj: Element) -> None:
@@ -217,6 +939,19 @@ class ElementDAO(object):
         # it can't be updated
         pass
 
+    @staticmethod
+    def iter(database: sqlite3.Connection) -> Iterator[Element]:
+        """
+        Iterate over all the elements from the element table.
+        The rows are read from the database as the iteration goes, so
+        the whole table is never held in memory.
+        :param database: A database handle
+        :return: An iterator over the Elements
+        """
+        for rows in SqliteHelper.fetch_batches(database, _SQL_ELEMENT_LIST):
+            for row in rows:
+                yield Element(*row)
+
     @staticmethod
     def list(database: sqlite3.Connection) -> list[Element]:
         """
@@ -224,17 +959,56 @@ class ElementDAO(object):
         :param database: A database handle
         :return: The list of Elements
         """
-        rows = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM element;""",
-        )
+        return [Element(*row) for row in SqliteHelper.fetch(database, _SQL_ELEMENT_LIST)]
+
+
+_SQL_ELEMENT_COMPONENT_CREATE = """
+CREATE TABLE IF NOT EXISTS element_component(
+    id INTEGER,
+    element_id INTEGER,
+    type INTEGER,
+    data TEXT,
+    PRIMARY KEY(id),
+    FOREIGN KEY(element_id) REFERENCES element(id) ON DELETE CASCADE
+);"""
+
+# Index of the components of each element, used by list_by_element
+_SQL_ELEMENT_COMPONENT_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_element_component_element ON element_component(element_id);"""
+
+_SQL_ELEMENT_COMPONENT_DROP = """
+DROP TABLE IF EXISTS element_component;"""
+
+_SQL_ELEMENT_COMPONENT_INSERT = """
+INSERT INTO element_component(
+    id, element_id, type, data
+) VALUES(NULL, ?, ?, ?);"""
+
+_SQL_ELEMENT_COMPONENT_DELETE = """
+DELETE FROM element_component WHERE id = ?;"""
 
-        result = list()
-        for row in rows:
-            result.append(Element(*row))
+_SQL_ELEMENT_COMPONENT_DELETE_MANY = """
+DELETE FROM element_component WHERE id IN (SELECT value FROM json_each(?));"""
 
-        return result
+_SQL_ELEMENT_COMPONENT_CLEAR = """
+DELETE FROM element_component;"""
+
+_SQL_ELEMENT_COMPONENT_GET = """
+SELECT id, element_id, type, data FROM element_component WHERE id = ?;"""
+
+_SQL_ELEMENT_COMPONENT_LIST_BY_ELEMENT = """
+SELECT id, element_id, type, data FROM element_component WHERE element_id = ?;"""
+
+_SQL_ELEMENT_COMPONENT_UPDATE = """
+UPDATE element_component SET
+    element_id = ?,
+    type = ?,
+    data = ?
+WHERE
+    id = ?;"""
+
+_SQL_ELEMENT_COMPONENT_LIST = """
+SELECT id, element_id, type, data FROM element_component;"""
 
 
 class ElementComponentDAO(object):
@@ -246,23 +1020,13 @@ class ElementComponentDAO(object):
     @staticmethod
     def create_table(database: sqlite3.Connection) -> None:
         """
-        Create the element_component table of the Sourcetrail database
-        if it doesn't exist.
+        Create the element_component table of the Sourcetrail database,
+        and its index on the elements, if they don't exist.
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """    
-            CREATE TABLE IF NOT EXISTS element_component(
-                id INTEGER, 
-                element_id INTEGER, 
-                type INTEGER, 
-                data TEXT, 
-                PRIMARY KEY(id), 
-                FOREIGN KEY(element_id) REFERENCES element(id) ON DELETE CASCADE
-            );""",
-        )
+        SqliteHelper.exec(database, _SQL_ELEMENT_COMPONENT_CREATE)
+        SqliteHelper.exec(database, _SQL_ELEMENT_COMPONENT_INDEX)
 
     @staticmethod
     def delete_table(database: sqlite3.Connection) -> None:
@@ -272,11 +1036,7 @@ class ElementComponentDAO(object):
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DROP TABLE IF EXISTS main.element_component;""",
-        )
+        SqliteHelper.exec(database, _SQL_ELEMENT_COMPONENT_DROP)
 
     @staticmethod
     def new(database: sqlite3.Connection, obj: ElementComponent) -> int:
@@ -286,13 +1046,18 @@ class ElementComponentDAO(object):
         :param obj: The object to insert
         :return: The id of the inserted element
         """
-        return SqliteHelper.exec(
-            database,
-            """
-            INSERT INTO element_component(
-                id, element_id, type, data
-            ) VALUES(NULL, ?, ?, ?);""",
-            (obj.elem_id, obj.type.value, obj.data),
+        return SqliteHelper.exec(database, _SQL_ELEMENT_COMPONENT_INSERT, (obj.elem_id, obj.type, obj.data))
+
+    @staticmethod
+    def new_many(database: sqlite3.Connection, objs: Iterable[ElementComponent]) -> int:
+        """
+        Insert many ElementComponents inside the element_component table with a single request.
+        :param database: A database handle
+        :param objs: The objects to insert
+        :return: The number of inserted element_components
+        """
+        return SqliteHelper.exec_many(
+            database, _SQL_ELEMENT_COMPONENT_INSERT, ((obj.elem_id, obj.type, obj.data) for obj in objs)
         )
 
     @staticmethod
@@ -303,12 +1068,19 @@ class ElementComponentDAO(object):
         :param obj: The object to delete
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM element_component WHERE id = ?;""",
-            (obj.id,),
-        )
+        SqliteHelper.exec(database, _SQL_ELEMENT_COMPONENT_DELETE, (obj.id,))
+
+    @staticmethod
+    def delete_many(database: sqlite3.Connection, elem_ids: Iterable[int]) -> None:
+        """
+        Delete the ElementComponents matching the given ids from the
+        element_component table with a single request, whatever the number
+        of ids.
+        :param database: A database handle
+        :param elem_ids: The ids of the element_components to delete
+        :return: None
+        """
+        SqliteHelper.exec(database, _SQL_ELEMENT_COMPONENT_DELETE_MANY, (json.dumps(list(elem_ids)),))
 
     @staticmethod
     def clear(database: sqlite3.Connection) -> None:
@@ -317,11 +1089,7 @@ class ElementComponentDAO(object):
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM element_component;""",
-        )
+        SqliteHelper.exec(database, _SQL_ELEMENT_COMPONENT_CLEAR)
 
     @staticmethod
     def get(database: sqlite3.Connection, elem_id: int) -> ElementComponent:
@@ -332,16 +1100,26 @@ class ElementComponentDAO(object):
         :return: A ElementComponent object that reflect the content
         inside the database
         """
-        out = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM element_component WHERE id = ?;""",
-            (elem_id,),
-        )
+        row = SqliteHelper.fetch_one(database, _SQL_ELEMENT_COMPONENT_GET, (elem_id,))
+        if row:
+            id_, element_id, type_, data = row
+            return ElementComponent(id_, element_id, _ELEMENT_COMPONENT_TYPES[type_], data)
 
-        if len(out) == 1:
-            id_, element_id, type_, data = out[0]
-            return ElementComponent(id_, element_id, ElementComponentType(type_), data)
+    @staticmethod
+    def list_by_element(database: sqlite3.Connection, elem_id: int) -> list[ElementComponent]:
+        """
+        Return the list of the components of an element, found through the
+        index on element_id rather than by scanning the whole table.
+        :param database: A database handle
+        :param elem_id: The id of the element
+        :return: The list of ElementComponents of the element
+        """
+        return [
+            ElementComponent(id_, element_id, _ELEMENT_COMPONENT_TYPES[type_], data)
+            for id_, element_id, type_, data in SqliteHelper.fetch(
+                database, _SQL_ELEMENT_COMPONENT_LIST_BY_ELEMENT, (elem_id,)
+            )
+        ]
 
     @staticmethod
     def update(database: sqlite3.Connection, obj: ElementComponent) -> None:
@@ -351,17 +1129,20 @@ class ElementComponentDAO(object):
         :param obj: The Element object to update
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            UPDATE element_component SET
-                element_id = ?, 
-                type = ?, 
-                data = ?
-            WHERE
-                id = ?;""",
-            (obj.elem_id, obj.type.value, obj.data, obj.id),
-        )
+        SqliteHelper.exec(database, _SQL_ELEMENT_COMPONENT_UPDATE, (obj.elem_id, obj.type, obj.data, obj.id))
+
+    @staticmethod
+    def iter(database: sqlite3.Connection) -> Iterator[ElementComponent]:
+        """
+        Iterate over all the element components from the element_component table.
+        The rows are read from the database as the iteration goes, so
+        the whole table is never held in memory.
+        :param database: A database handle
+        :return: An iterator over the ElementComponents
+        """
+        for rows in SqliteHelper.fetch_batches(database, _SQL_ELEMENT_COMPONENT_LIST):
+            for id_, element_id, type_, data in rows:
+                yield ElementComponent(id_, element_id, _ELEMENT_COMPONENT_TYPES[type_], data)
 
     @staticmethod
     def list(database: sqlite3.Connection) -> list[ElementComponent]:
@@ -370,18 +1151,92 @@ class ElementComponentDAO(object):
         :param database: A database handle
         :return: The list of ElementComponents
         """
-        rows = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM element_component;""",
-        )
+        return [
+            ElementComponent(id_, element_id, _ELEMENT_COMPONENT_TYPES[type_], data)
+            for id_, element_id, type_, data in SqliteHelper.fetch(database, _SQL_ELEMENT_COMPONENT_LIST)
+        ]
 
-        result = list()
-        for row in rows:
-            id_, element_id, type_, data = row
-            result.append(ElementComponent(id_, element_id, ElementComponentType(type_), data))
 
-        return result
+_SQL_EDGE_CREATE = """
+CREATE TABLE IF NOT EXISTS edge(
+    id INTEGER NOT NULL,
+    type INTEGER NOT NULL,
+    source_node_id INTEGER NOT NULL,
+    target_node_id INTEGER NOT NULL,
+    color TEXT,
+    hover_display TEXT,
+    PRIMARY KEY(id),
+    FOREIGN KEY(id) REFERENCES element(id) ON DELETE CASCADE,
+    FOREIGN KEY(source_node_id) REFERENCES node(id) ON DELETE CASCADE,
+    FOREIGN KEY(target_node_id) REFERENCES node(id) ON DELETE CASCADE
+);"""
+
+# Indexes of the edges leaving and entering each node, used by
+# list_by_source and list_by_target
+_SQL_EDGE_INDEX_SOURCE = """
+CREATE INDEX IF NOT EXISTS idx_edge_source ON edge(source_node_id);"""
+
+_SQL_EDGE_INDEX_TARGET = """
+CREATE INDEX IF NOT EXISTS idx_edge_target ON edge(target_node_id);"""
+
+_SQL_EDGE_DROP = """
+DROP TABLE IF EXISTS edge;"""
+
+_SQL_EDGE_INSERT = """
+INSERT INTO edge(
+    id, type, source_node_id, target_node_id, hover_display
+) VALUES(?, ?, ?, ?, ?);"""
+
+_SQL_EDGE_INSERT_ATOMIC = """
+INSERT INTO edge(
+    id, type, source_node_id, target_node_id, hover_display
+) VALUES(last_insert_rowid(), ?, ?, ?, ?);"""
+
+_SQL_EDGE_INSERT_COLUMNS = """
+INSERT INTO edge(id, type, source_node_id, target_node_id) VALUES(?, ?, ?, ?);"""
+
+_SQL_EDGE_DELETE = """
+DELETE FROM edge WHERE id = ?;"""
+
+_SQL_EDGE_DELETE_MANY = """
+DELETE FROM edge WHERE id IN (SELECT value FROM json_each(?));"""
+
+_SQL_EDGE_CLEAR = """
+DELETE FROM edge;"""
+
+_SQL_EDGE_GET = """
+SELECT id, type, source_node_id, target_node_id, hover_display FROM edge WHERE id = ?;"""
+
+_SQL_EDGE_GET_MANY = """
+SELECT
+    id, type, source_node_id, target_node_id, hover_display
+FROM edge WHERE id IN (SELECT value FROM json_each(?));"""
+
+_SQL_EDGE_LIST_BY_SOURCE = """
+SELECT id, type, source_node_id, target_node_id, hover_display FROM edge WHERE source_node_id = ?;"""
+
+_SQL_EDGE_LIST_BY_TARGET = """
+SELECT id, type, source_node_id, target_node_id, hover_display FROM edge WHERE target_node_id = ?;"""
+
+_SQL_EDGE_UPDATE = """
+UPDATE edge SET
+    type = ?,
+    source_node_id = ?,
+    target_node_id = ?
+WHERE
+    id = ?;"""
+
+_SQL_EDGE_LIST = """
+SELECT id, type, source_node_id, target_node_id, hover_display FROM edge;"""
+
+_SQL_EDGE_LIST_SOA = """
+SELECT id, type, source_node_id, target_node_id FROM edge;"""
+
+_SQL_EDGE_SET_COLOR = """
+UPDATE edge SET
+    color=?
+WHERE
+    id=?;"""
 
 
 class EdgeDAO(object):
@@ -393,27 +1248,14 @@ class EdgeDAO(object):
     @staticmethod
     def create_table(database: sqlite3.Connection) -> None:
         """
-        Create the edge table of the Sourcetrail database
-        if it doesn't exist.
+        Create the edge table of the Sourcetrail database, and its
+        indexes on the source and target nodes, if they don't exist.
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """    
-            CREATE TABLE IF NOT EXISTS edge(
-                id INTEGER NOT NULL, 
-                type INTEGER NOT NULL, 
-                source_node_id INTEGER NOT NULL, 
-                target_node_id INTEGER NOT NULL, 
-                color TEXT, 
-                hover_display TEXT, 
-                PRIMARY KEY(id), 
-                FOREIGN KEY(id) REFERENCES element(id) ON DELETE CASCADE, 
-                FOREIGN KEY(source_node_id) REFERENCES node(id) ON DELETE CASCADE, 
-                FOREIGN KEY(target_node_id) REFERENCES node(id) ON DELETE CASCADE
-            );""",
-        )
+        SqliteHelper.exec(database, _SQL_EDGE_CREATE)
+        SqliteHelper.exec(database, _SQL_EDGE_INDEX_SOURCE)
+        SqliteHelper.exec(database, _SQL_EDGE_INDEX_TARGET)
 
     @staticmethod
     def delete_table(database: sqlite3.Connection) -> None:
@@ -423,11 +1265,7 @@ class EdgeDAO(object):
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DROP TABLE IF EXISTS main.edge;""",
-        )
+        SqliteHelper.exec(database, _SQL_EDGE_DROP)
 
     @staticmethod
     def new(database: sqlite3.Connection, obj: Edge) -> int:
@@ -439,13 +1277,63 @@ class EdgeDAO(object):
         """
         return SqliteHelper.exec(
             database,
-            """
-            INSERT INTO edge(
-                id, type, source_node_id, target_node_id, hover_display
-            ) VALUES(?, ?, ?, ?, ?);""",
-            (obj.id, obj.type.value, obj.src, obj.dst, obj.hover_display),
+            _SQL_EDGE_INSERT,
+            (obj.id, obj.type, obj.src, obj.dst, obj.hover_display),
+        )
+
+    @staticmethod
+    def new_many(database: sqlite3.Connection, objs: Iterable[Edge]) -> int:
+        """
+        Insert many Edges inside the edge table with a single request.
+        :param database: A database handle
+        :param objs: The objects to insert
+        :return: The number of inserted edges
+        """
+        return SqliteHelper.exec_many(
+            database,
+            _SQL_EDGE_INSERT,
+            ((obj.id, obj.type, obj.src, obj.dst, obj.hover_display) for obj in objs),
         )
 
+    @staticmethod
+    def new_atomic(database: sqlite3.Connection, obj: Edge) -> int:
+        """
+        Insert a new Element and the Edge referencing it. Each statement is
+        executed on its own, the edge takes the id of the element through
+        last_insert_rowid() so the id is never fetched back in Python.
+        The id of `obj` is ignored.
+        :param database: A database handle
+        :param obj: The object to insert
+        :return: The id of the inserted element
+        """
+        cur = SqliteHelper.cursor(database, "edge.new_atomic")
+        cur.execute(_SQL_ELEMENT_INSERT)
+        cur.execute(_SQL_EDGE_INSERT_ATOMIC, (obj.type, obj.src, obj.dst, obj.hover_display))
+        return cur.lastrowid
+
+    @staticmethod
+    def new_columns(
+        database: sqlite3.Connection,
+        ids: Iterable[int],
+        types: Iterable[int],
+        srcs: Iterable[int],
+        dsts: Iterable[int],
+    ) -> int:
+        """
+        Insert many Edges inside the edge table from columnar data. The
+        rows are assembled by `zip` while sqlite consumes them, so no
+        Edge object nor intermediate list is built. The hover_display is
+        left empty, and the element rows the ids reference must already
+        exist.
+        :param database: A database handle
+        :param ids: The ids of the edges
+        :param types: The raw values of the edge types
+        :param srcs: The ids of the source nodes
+        :param dsts: The ids of the destination nodes
+        :return: The number of inserted edges
+        """
+        return SqliteHelper.exec_many(database, _SQL_EDGE_INSERT_COLUMNS, zip(ids, types, srcs, dsts))
+
     @staticmethod
     def delete(database: sqlite3.Connection, obj: Edge) -> None:
         """
@@ -454,12 +1342,18 @@ class EdgeDAO(object):
         :param obj: The object to delete
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM edge WHERE id = ?;""",
-            (obj.id,),
-        )
+        SqliteHelper.exec(database, _SQL_EDGE_DELETE, (obj.id,))
+
+    @staticmethod
+    def delete_many(database: sqlite3.Connection, elem_ids: Iterable[int]) -> None:
+        """
+        Delete the Edges matching the given ids from the edge table with a
+        single request, whatever the number of ids.
+        :param database: A database handle
+        :param elem_ids: The ids of the edges to delete
+        :return: None
+        """
+        SqliteHelper.exec(database, _SQL_EDGE_DELETE_MANY, (json.dumps(list(elem_ids)),))
 
     @staticmethod
     def clear(database: sqlite3.Connection) -> None:
@@ -468,11 +1362,7 @@ class EdgeDAO(object):
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM edge;""",
-        )
+        SqliteHelper.exec(database, _SQL_EDGE_CLEAR)
 
     @staticmethod
     def get(database: sqlite3.Connection, elem_id: int) -> Edge:
@@ -483,16 +1373,58 @@ class EdgeDAO(object):
         :return: A Edge object that reflect the content inside
         the database
         """
-        out = SqliteHelper.fetch(
-            database,
-            """
-            SELECT id, type, source_node_id, target_node_id, hover_display FROM edge WHERE id = ?;""",
-            (elem_id,),
-        )
+        row = SqliteHelper.fetch_one(database, _SQL_EDGE_GET, (elem_id,))
+        if row:
+            id_, type_, src, dst, hover_display = row
+            return Edge(id_, _EDGE_TYPES[type_], src, dst, hover_display)
+
+    @staticmethod
+    def get_many(database: sqlite3.Connection, elem_ids: Iterable[int]) -> dict[int, Edge]:
+        """
+        Return the edges from the database matching the given ids, using
+        a single request whatever the number of ids. The ids are bound as
+        one JSON array so the request text stays the same.
+        :param database: A database handle
+        :param elem_ids: The ids of the edges to retrieve
+        :return: A dict mapping the id of each edge found to its Edge
+        object, ids that do not match any edge are left out
+        """
+        rows = SqliteHelper.fetch(database, _SQL_EDGE_GET_MANY, (json.dumps(list(elem_ids)),))
+        return {
+            id_: Edge(id_, _EDGE_TYPES[type_], src, dst, hover_display) for id_, type_, src, dst, hover_display in rows
+        }
+
+    @staticmethod
+    def list_by_source(database: sqlite3.Connection, node_id: int) -> list[Edge]:
+        """
+        Return the list of the edges leaving a node, found through the
+        index on source_node_id rather than by scanning the whole table.
+        :param database: A database handle
+        :param node_id: The id of the source node
+        :return: The list of Edges whose source is the node
+        """
+        return [
+            Edge(id_, _EDGE_TYPES[type_], src, dst, hover_display)
+            for id_, type_, src, dst, hover_display in SqliteHelper.fetch(
+                database, _SQL_EDGE_LIST_BY_SOURCE, (node_id,)
+            )
+        ]
 
-        if len(out) == 1:
-            id_, type_, src, dst, hover_display = out[0]
-            return Edge(id_, EdgeType(type_), src, dst, hover_display)
+    @staticmethod
+    def list_by_target(database: sqlite3.Connection, node_id: int) -> list[Edge]:
+        """
+        Return the list of the edges entering a node, found through the
+        index on target_node_id rather than by scanning the whole table.
+        :param database: A database handle
+        :param node_id: The id of the target node
+        :return: The list of Edges whose target is the node
+        """
+        return [
+            Edge(id_, _EDGE_TYPES[type_], src, dst, hover_display)
+            for id_, type_, src, dst, hover_display in SqliteHelper.fetch(
+                database, _SQL_EDGE_LIST_BY_TARGET, (node_id,)
+            )
+        ]
 
     @staticmethod
     def update(database: sqlite3.Connection, obj: Edge) -> None:
@@ -502,17 +1434,32 @@ class EdgeDAO(object):
         :param obj: The Edge object to update
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            UPDATE edge SET
-                type = ?, 
-                source_node_id = ?,
-                target_node_id = ?
-            WHERE
-                id = ?;""",
-            (obj.type.value, obj.src, obj.dst, obj.id),
-        )
+        SqliteHelper.exec(database, _SQL_EDGE_UPDATE, (obj.type, obj.src, obj.dst, obj.id))
+
+    @staticmethod
+    def iter_raw(database: sqlite3.Connection) -> Iterator[tuple[int, int, int, int, str]]:
+        """
+        Iterate over the raw rows of the edge table, without building any
+        Edge object. Useful for callers that only aggregate the content of
+        the table (e.g. counting edges by type).
+        :param database: A database handle
+        :return: An iterator over (id, type, source_node_id, target_node_id,
+        hover_display) tuples
+        """
+        for rows in SqliteHelper.fetch_batches(database, _SQL_EDGE_LIST):
+            yield from rows
+
+    @staticmethod
+    def iter(database: sqlite3.Connection) -> Iterator[Edge]:
+        """
+        Iterate over all the edges from the edge table.
+        The rows are read from the database as the iteration goes, so
+        the whole table is never held in memory.
+        :param database: A database handle
+        :return: An iterator over the Edges
+        """
+        for id_, type_, src, dst, hover_display in EdgeDAO.iter_raw(database):
+            yield Edge(id_, _EDGE_TYPES[type_], src, dst, hover_display)
 
     @staticmethod
     def list(database: sqlite3.Connection) -> list[Edge]:
@@ -521,18 +1468,31 @@ class EdgeDAO(object):
         :param database: A database handle
         :return: The list of Edges
         """
-        rows = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM edge;""",
-        )
+        return [
+            Edge(id_, _EDGE_TYPES[type_], src, dst, hover_display)
+            for id_, type_, src, dst, hover_display in SqliteHelper.fetch(database, _SQL_EDGE_LIST)
+        ]
+
+    @staticmethod
+    def list_soa(database: sqlite3.Connection) -> tuple[array.array, array.array, array.array, array.array]:
+        """
+        Return the content of the edge table column-wise, without building
+        any Edge object. This is meant for analytical passes (graph walks,
+        counts by type, etc.) that only need the raw integer values.
+        :param database: A database handle
+        :return: A tuple of four int64 arrays: (ids, types, sources, targets)
+        """
+        ids, types, sources, targets = (array.array("q") for _ in range(4))
 
-        result = list()
-        for row in rows:
-            id_, type_, src, dst = row
-            result.append(Edge(id_, EdgeType(type_), src, dst))
+        for rows in SqliteHelper.fetch_batches(database, _SQL_EDGE_LIST_SOA):
+            # Transpose the batch in C rather than unpacking row by row
+            batch_ids, batch_types, batch_sources, batch_targets = zip(*rows)
+            ids.extend(batch_ids)
+            types.extend(batch_types)
+            sources.extend(batch_sources)
+            targets.extend(batch_targets)
 
-        return result
+        return ids, types, sources, targets
 
     @staticmethod
     def set_color(database: sqlite3.Connection, id: int, new_color: str) -> None:
@@ -543,15 +1503,85 @@ class EdgeDAO(object):
         :param new_color: RGB hex code or name of the edge's new color
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            UPDATE edge SET
-                color=?
-            WHERE
-                id=?;""",
-            (new_color, id),
-        )
+        SqliteHelper.exec(database, _SQL_EDGE_SET_COLOR, (new_color, id))
+
+
+_SQL_NODE_CREATE = """
+CREATE TABLE IF NOT EXISTS node(
+    id INTEGER NOT NULL,
+    type INTEGER NOT NULL,
+    serialized_name TEXT,
+    color TEXT,
+    hover_display TEXT,
+    custom_command TEXT,
+    custom_command_desc TEXT,
+    PRIMARY KEY(id),
+    FOREIGN KEY(id) REFERENCES element(id) ON DELETE CASCADE
+);"""
+
+_SQL_NODE_DROP = """
+DROP TABLE IF EXISTS node;"""
+
+_SQL_NODE_INSERT = """
+INSERT INTO node(
+    id, type, serialized_name, hover_display
+) VALUES(?, ?, ?, ?);"""
+
+_SQL_NODE_INSERT_ATOMIC = """
+INSERT INTO node(
+    id, type, serialized_name, hover_display
+) VALUES(last_insert_rowid(), ?, ?, ?);"""
+
+_SQL_NODE_INSERT_COLUMNS = """
+INSERT INTO node(id, type, serialized_name) VALUES(?, ?, ?);"""
+
+_SQL_NODE_DELETE = """
+DELETE FROM node WHERE id = ?;"""
+
+_SQL_NODE_DELETE_MANY = """
+DELETE FROM node WHERE id IN (SELECT value FROM json_each(?));"""
+
+_SQL_NODE_CLEAR = """
+DELETE FROM node;"""
+
+_SQL_NODE_GET = """
+SELECT id, type, serialized_name, hover_display FROM node WHERE id = ?;"""
+
+_SQL_NODE_GET_MANY = """
+SELECT
+    id, type, serialized_name, hover_display
+FROM node WHERE id IN (SELECT value FROM json_each(?));"""
+
+_SQL_NODE_GET_BY_NAME = """
+SELECT id, type, serialized_name, hover_display FROM node WHERE serialized_name = ? LIMIT 1;"""
+
+# Walked backwards so that the first node recorded under a name wins,
+# as with _SQL_NODE_GET_BY_NAME
+_SQL_NODE_IDS_BY_NAME = """
+SELECT serialized_name, id FROM node ORDER BY id DESC;"""
+
+_SQL_NODE_UPDATE = """
+UPDATE node SET
+    type = ?,
+    serialized_name = ?
+WHERE
+    id = ?;"""
+
+_SQL_NODE_LIST = """
+SELECT id, type, serialized_name, hover_display FROM node;"""
+
+_SQL_NODE_SET_COLOR = """
+UPDATE node SET
+    color=?
+WHERE
+    id=?;"""
+
+_SQL_NODE_SET_CUSTOM_COMMAND = """
+UPDATE node SET
+    custom_command=?,
+    custom_command_desc=?
+WHERE
+    id=?;"""
 
 
 class NodeDAO(object):
@@ -568,21 +1598,7 @@ class NodeDAO(object):
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """    
-            CREATE TABLE IF NOT EXISTS node(
-                id INTEGER NOT NULL, 
-                type INTEGER NOT NULL, 
-                serialized_name TEXT, 
-                color TEXT, 
-                hover_display TEXT, 
-                custom_command TEXT, 
-                custom_command_desc TEXT, 
-                PRIMARY KEY(id), 
-                FOREIGN KEY(id) REFERENCES element(id) ON DELETE CASCADE
-            );""",
-        )
+        SqliteHelper.exec(database, _SQL_NODE_CREATE)
 
     @staticmethod
     def delete_table(database: sqlite3.Connection) -> None:
@@ -592,11 +1608,7 @@ class NodeDAO(object):
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DROP TABLE IF EXISTS main.node;""",
-        )
+        SqliteHelper.exec(database, _SQL_NODE_DROP)
 
     @staticmethod
     def new(database: sqlite3.Connection, obj: Node) -> int:
@@ -606,15 +1618,54 @@ class NodeDAO(object):
         :param obj: The object to insert
         :return: The id of the inserted element
         """
-        return SqliteHelper.exec(
-            database,
-            """
-            INSERT INTO node(
-                id, type, serialized_name, hover_display 
-            ) VALUES(?, ?, ?, ?);""",
-            (obj.id, obj.type.value, obj.name, obj.hover_display),
+        return SqliteHelper.exec(database, _SQL_NODE_INSERT, (obj.id, obj.type, obj.name, obj.hover_display))
+
+    @staticmethod
+    def new_many(database: sqlite3.Connection, objs: Iterable[Node]) -> int:
+        """
+        Insert many Nodes inside the node table with a single request.
+        :param database: A database handle
+        :param objs: The objects to insert
+        :return: The number of inserted nodes
+        """
+        return SqliteHelper.exec_many(
+            database, _SQL_NODE_INSERT, ((obj.id, obj.type, obj.name, obj.hover_display) for obj in objs)
         )
 
+    @staticmethod
+    def new_atomic(database: sqlite3.Connection, obj: Node) -> int:
+        """
+        Insert a new Element and the Node referencing it. Each statement is
+        executed on its own, the node takes the id of the element through
+        last_insert_rowid() so the id is never fetched back in Python.
+        The id of `obj` is ignored.
+        :param database: A database handle
+        :param obj: The object to insert
+        :return: The id of the inserted element
+        """
+        cur = SqliteHelper.cursor(database, "node.new_atomic")
+        cur.execute(_SQL_ELEMENT_INSERT)
+        cur.execute(_SQL_NODE_INSERT_ATOMIC, (obj.type, obj.name, obj.hover_display))
+        return cur.lastrowid
+
+    @staticmethod
+    def new_columns(
+        database: sqlite3.Connection, ids: Iterable[int], types: Iterable[int], names: Iterable[str]
+    ) -> int:
+        """
+        Insert many Nodes inside the node table from columnar data. The
+        rows are assembled by `zip` while sqlite consumes them, so no
+        Node object nor intermediate list is built. Only the id, type and
+        serialized name are written, the hover_display is left empty, and
+        the element rows the ids reference must already exist.
+        :param database: A database handle
+        :param ids: The ids of the nodes
+        :param types: The raw values of the node types
+        :param names: The serialized names of the nodes
+        :return: The number of inserted nodes
+        """
+        return SqliteHelper.exec_many(database, _SQL_NODE_INSERT_COLUMNS, zip(ids, types, names))
+
     @staticmethod
     def delete(database: sqlite3.Connection, obj: Node) -> None:
         """
@@ -623,12 +1674,18 @@ class NodeDAO(object):
         :param obj: The object to delete
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM node WHERE id = ?;""",
-            (obj.id,),
-        )
+        SqliteHelper.exec(database, _SQL_NODE_DELETE, (obj.id,))
+
+    @staticmethod
+    def delete_many(database: sqlite3.Connection, elem_ids: Iterable[int]) -> None:
+        """
+        Delete the Nodes matching the given ids from the node table with a
+        single request, whatever the number of ids.
+        :param database: A database handle
+        :param elem_ids: The ids of the nodes to delete
+        :return: None
+        """
+        SqliteHelper.exec(database, _SQL_NODE_DELETE_MANY, (json.dumps(list(elem_ids)),))
 
     @staticmethod
     def clear(database: sqlite3.Connection) -> None:
@@ -637,11 +1694,7 @@ class NodeDAO(object):
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM node;""",
-        )
+        SqliteHelper.exec(database, _SQL_NODE_CLEAR)
 
     @staticmethod
     def get(database: sqlite3.Connection, elem_id: int) -> Node:
@@ -652,16 +1705,27 @@ class NodeDAO(object):
         :return: A Node object that reflect the content inside
         the database
         """
-        out = SqliteHelper.fetch(
-            database,
-            """
-            SELECT id, type, serialized_name, hover_display FROM node WHERE id = ?;""",
-            (elem_id,),
-        )
+        row = SqliteHelper.fetch_one(database, _SQL_NODE_GET, (elem_id,))
+        if row:
+            id_, type_, serialized_name, hover_display = row
+            return Node(id_, _NODE_TYPES[type_], serialized_name, hover_display)
 
-        if len(out) == 1:
-            id_, type_, serialized_name, hover_display = out[0]
-            return Node(id_, NodeType(type_), serialized_name, hover_display)
+    @staticmethod
+    def get_many(database: sqlite3.Connection, elem_ids: Iterable[int]) -> dict[int, Node]:
+        """
+        Return the nodes from the database matching the given ids, using
+        a single request whatever the number of ids. The ids are bound as
+        one JSON array so the request text stays the same.
+        :param database: A database handle
+        :param elem_ids: The ids of the nodes to retrieve
+        :return: A dict mapping the id of each node found to its Node
+        object, ids that do not match any node are left out
+        """
+        rows = SqliteHelper.fetch(database, _SQL_NODE_GET_MANY, (json.dumps(list(elem_ids)),))
+        return {
+            id_: Node(id_, _NODE_TYPES[type_], serialized_name, hover_display)
+            for id_, type_, serialized_name, hover_display in rows
+        }
 
     @staticmethod
     def get_by_name(database: sqlite3.Connection, name: str) -> Node:
@@ -672,16 +1736,20 @@ class NodeDAO(object):
         :return: A Node object that reflect the content inside
         the database
         """
-        out = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM node WHERE serialized_name = ? LIMIT 1;""",
-            (name,),
-        )
+        row = SqliteHelper.fetch_one(database, _SQL_NODE_GET_BY_NAME, (name,))
+        if row:
+            id_, type_, serialized_name, hover_display = row
+            return Node(id_, _NODE_TYPES[type_], serialized_name, hover_display)
 
-        if len(out) == 1:
-            id_, type_, serialized_name = out[0]
-            return Node(id_, NodeType(type_), serialized_name)
+    @staticmethod
+    def ids_by_name(database: sqlite3.Connection) -> dict[str, int]:
+        """
+        Return the ids of all the nodes indexed by their serialized_name,
+        read with a single request
+        :param database: A database handle
+        :return: A dict mapping the serialized names to the node ids
+        """
+        return dict(SqliteHelper.fetch(database, _SQL_NODE_IDS_BY_NAME))
 
     @staticmethod
     def update(database: sqlite3.Connection, obj: Node) -> None:
@@ -691,16 +1759,32 @@ class NodeDAO(object):
         :param obj: The Node object to update
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            UPDATE node SET
-                type = ?, 
-                serialized_name = ?
-            WHERE
-                id = ?;""",
-            (obj.type.value, obj.name, obj.id),
-        )
+        SqliteHelper.exec(database, _SQL_NODE_UPDATE, (obj.type, obj.name, obj.id))
+
+    @staticmethod
+    def iter_raw(database: sqlite3.Connection) -> Iterator[tuple[int, int, str, str]]:
+        """
+        Iterate over the raw rows of the node table, without building any
+        Node object. Useful for callers that only aggregate the content of
+        the table (e.g. counting nodes by type).
+        :param database: A database handle
+        :return: An iterator over (id, type, serialized_name, hover_display)
+        tuples
+        """
+        for rows in SqliteHelper.fetch_batches(database, _SQL_NODE_LIST):
+            yield from rows
+
+    @staticmethod
+    def iter(database: sqlite3.Connection) -> Iterator[Node]:
+        """
+        Iterate over all the nodes from the node table.
+        The rows are read from the database as the iteration goes, so
+        the whole table is never held in memory.
+        :param database: A database handle
+        :return: An iterator over the Nodes
+        """
+        for id_, type_, serialized_name, hover_display in NodeDAO.iter_raw(database):
+            yield Node(id_, _NODE_TYPES[type_], serialized_name, hover_display)
 
     @staticmethod
     def list(database: sqlite3.Connection) -> list[Node]:
@@ -709,18 +1793,10 @@ class NodeDAO(object):
         :param database: A database handle
         :return: The list of Nodes
         """
-        rows = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM node;""",
-        )
-
-        result = list()
-        for row in rows:
-            id_, type_, serialized_name = row
-            result.append(Node(id_, NodeType(type_), serialized_name))
-
-        return result
+        return [
+            Node(id_, _NODE_TYPES[type_], serialized_name, hover_display)
+            for id_, type_, serialized_name, hover_display in SqliteHelper.fetch(database, _SQL_NODE_LIST)
+        ]
 
     @staticmethod
     def set_color(database: sqlite3.Connection, id: int, new_color: str) -> None:
@@ -731,15 +1807,7 @@ class NodeDAO(object):
         :param new_color: RGB hex code or name of the node's new color
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            UPDATE node SET
-                color=?
-            WHERE
-                id=?;""",
-            (new_color, id),
-        )
+        SqliteHelper.exec(database, _SQL_NODE_SET_COLOR, (new_color, id))
 
     @staticmethod
     def set_custom_command(database: sqlite3.Connection, id: int, custom_command: tuple) -> None:
@@ -750,16 +1818,56 @@ class NodeDAO(object):
         :param custom_command: The command to execute (including arguments) and its description
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            UPDATE node SET
-                custom_command=?,
-                custom_command_desc=?
-            WHERE
-                id=?;""",
-            (custom_command[0], custom_command[1], id),
-        )
+        SqliteHelper.exec(database, _SQL_NODE_SET_CUSTOM_COMMAND, (custom_command[0], custom_command[1], id))
+
+
+_SQL_NODE_TYPE_CREATE = """
+CREATE TABLE IF NOT EXISTS node_type(
+    id INTEGER NOT NULL,
+    graph_display TEXT,
+    hover_display TEXT,
+    PRIMARY KEY(id)
+);"""
+
+_SQL_NODE_TYPE_INIT = """
+INSERT OR IGNORE INTO node_type(id,graph_display,hover_display) VALUES
+    (1, 'Symbols', 'symbol'),
+    (2, 'Types', 'type'),
+    (4, '', 'built-in type'),
+    (8, 'Modules', 'module'),
+    (16, 'Namespaces', 'namespace'),
+    (32, 'Packages', 'package'),
+    (64, 'Structs', 'struct'),
+    (128, 'Classes', 'class'),
+    (256, 'Interfaces', 'interface'),
+    (512, 'Annotations', 'annotation'),
+    (1024, 'Global variables', 'global variable'),
+    (2048, '', 'field'),
+    (4096, 'Functions', 'function'),
+    (8192, '', 'method'),
+    (16384, 'Enums', 'enum'),
+    (32768, '', 'enum constant'),
+    (65536, 'Typedefs', 'typedef'),
+    (131072, 'Type parameters', 'type parameter'),
+    (262144, 'Files', 'file'),
+    (524288, 'Macros', 'macro'),
+    (1048576, 'Unions', 'union');"""
+
+_SQL_NODE_TYPE_DROP = """
+DROP TABLE IF EXISTS node_type;"""
+
+_SQL_NODE_TYPE_CLEAR = """
+DELETE FROM node_type;"""
+
+_SQL_NODE_TYPE_GET_BY_ID = """
+SELECT id, graph_display, hover_display FROM node_type WHERE id=? LIMIT 1;"""
+
+_SQL_NODE_TYPE_UPDATE = """
+UPDATE node_type SET
+    graph_display=?,
+    hover_display=?
+WHERE
+    id=?;"""
 
 
 class NodeTypeDAO(object):
@@ -774,16 +1882,7 @@ class NodeTypeDAO(object):
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            CREATE TABLE IF NOT EXISTS node_type(
-                id INTEGER NOT NULL, 
-                graph_display TEXT, 
-                hover_display TEXT, 
-                PRIMARY KEY(id)
-            );""",
-        )
+        SqliteHelper.exec(database, _SQL_NODE_TYPE_CREATE)
         NodeTypeDAO.init(database)
 
     @staticmethod
@@ -793,11 +1892,7 @@ class NodeTypeDAO(object):
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DROP TABLE IF EXISTS main.node_type;""",
-        )
+        SqliteHelper.exec(database, _SQL_NODE_TYPE_DROP)
 
     @staticmethod
     def clear(database: sqlite3.Connection) -> None:
@@ -806,11 +1901,7 @@ class NodeTypeDAO(object):
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM node_type;""",
-        )
+        SqliteHelper.exec(database, _SQL_NODE_TYPE_CLEAR)
         NodeTypeDAO.init(database)
 
     @staticmethod
@@ -820,32 +1911,7 @@ class NodeTypeDAO(object):
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-        INSERT OR IGNORE INTO node_type(id,graph_display,hover_display) VALUES
-            (1, 'Symbols', 'symbol'),
-            (2, 'Types', 'type'),
-            (4, '', 'built-in type'),
-            (8, 'Modules', 'module'),
-            (16, 'Namespaces', 'namespace'),
-            (32, 'Packages', 'package'),
-            (64, 'Structs', 'struct'),
-            (128, 'Classes', 'class'),
-            (256, 'Interfaces', 'interface'),
-            (512, 'Annotations', 'annotation'),
-            (1024, 'Global variables', 'global variable'),
-            (2048, '', 'field'),
-            (4096, 'Functions', 'function'),
-            (8192, '', 'method'),
-            (16384, 'Enums', 'enum'),
-            (32768, '', 'enum constant'),
-            (65536, 'Typedefs', 'typedef'),
-            (131072, 'Type parameters', 'type parameter'),
-            (262144, 'Files', 'file'),
-            (524288, 'Macros', 'macro'),
-            (1048576, 'Unions', 'union');""",
-        )
+        SqliteHelper.exec(database, _SQL_NODE_TYPE_INIT)
 
     @staticmethod
     def get_by_id(database: sqlite3.Connection, id: NodeType) -> NodeDisplay:
@@ -855,14 +1921,9 @@ class NodeTypeDAO(object):
         :param id: the id of the object to return
         :return: The object with the specified id.
         """
-        out = SqliteHelper.fetch(
-            database,
-            """
-                           SELECT * FROM node_type WHERE id=? LIMIT 1;""",
-            (id.value,),
-        )
-        if len(out) == 1:
-            id, graph_display, hover_display = out[0]
+        row = SqliteHelper.fetch_one(database, _SQL_NODE_TYPE_GET_BY_ID, (id,))
+        if row:
+            id, graph_display, hover_display = row
             return NodeDisplay(id, graph_display, hover_display)
 
     @staticmethod
@@ -873,850 +1934,805 @@ class NodeTypeDAO(object):
         :param obj: the type to change
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            UPDATE node_type SET
-                graph_display=?,
-                hover_display=? 
-            WHERE
-                id=?;""",
-            (obj.graph_display, obj.hover_display, obj.id.value),
-        )
+        SqliteHelper.exec(database, _SQL_NODE_TYPE_UPDATE, (obj.graph_display, obj.hover_display, obj.id))
+
+
+_SQL_SYMBOL_CREATE = """
+CREATE TABLE symbol(
+    id INTEGER NOT NULL,
+    definition_kind INTEGER NOT NULL,
+    PRIMARY KEY(id),
+    FOREIGN KEY(id) REFERENCES node(id) ON DELETE CASCADE
+);"""
+
+_SQL_SYMBOL_DROP = """
+DROP TABLE IF EXISTS symbol;"""
+
+_SQL_SYMBOL_INSERT = """
+INSERT INTO symbol(
+    id, definition_kind
+) VALUES(?, ?);"""
+
+_SQL_SYMBOL_DELETE = """
+DELETE FROM symbol WHERE id = ?;"""
 
+_SQL_SYMBOL_DELETE_MANY = """
+DELETE FROM symbol WHERE id IN (SELECT value FROM json_each(?));"""
 
-class SymbolDAO(object):
+_SQL_SYMBOL_CLEAR = """
+DELETE FROM symbol;"""
+
+_SQL_SYMBOL_COUNT = """
+SELECT COUNT(*) FROM symbol;"""
+
+_SQL_SYMBOL_GET = """
+SELECT id, definition_kind FROM symbol WHERE id = ?;"""
+
+_SQL_SYMBOL_UPDATE = """
+UPDATE symbol SET
+    definition_kind = ?
+WHERE
+    id = ?;"""
+
+_SQL_SYMBOL_LIST = """
+SELECT id, definition_kind FROM symbol;"""
+
+
+class SymbolDAO(TableDAO[Symbol]):
     """
     This class is a static class that can manipulate Symbol objects,
     inserting and removing them from a sqlite database.
     """
 
+    _SQL_CREATE = _SQL_SYMBOL_CREATE
+    _SQL_DROP = _SQL_SYMBOL_DROP
+    _SQL_INSERT = _SQL_SYMBOL_INSERT
+    _SQL_DELETE = _SQL_SYMBOL_DELETE
+    _SQL_DELETE_MANY = _SQL_SYMBOL_DELETE_MANY
+    _SQL_CLEAR = _SQL_SYMBOL_CLEAR
+    _SQL_COUNT = _SQL_SYMBOL_COUNT
+    _SQL_GET = _SQL_SYMBOL_GET
+    _SQL_UPDATE = _SQL_SYMBOL_UPDATE
+    _SQL_LIST = _SQL_SYMBOL_LIST
+
     @staticmethod
-    def create_table(database: sqlite3.Connection) -> None:
+    def _to_row(obj: Symbol) -> tuple:
+        return (obj.id, obj.definition_kind)
+
+    @staticmethod
+    def _from_row(row: tuple) -> Symbol:
+        id_, type_ = row
+        return Symbol(id_, _SYMBOL_TYPES[type_])
+
+
+_SQL_FILE_CREATE = """
+CREATE TABLE file(
+    id INTEGER NOT NULL,
+    path TEXT,
+    language TEXT,
+    modification_time TEXT,
+    indexed INTEGER,
+    complete INTEGER,
+    line_count INTEGER,
+    PRIMARY KEY(id),
+    FOREIGN KEY(id) REFERENCES node(id) ON DELETE CASCADE
+);"""
+
+_SQL_FILE_INSERT = """
+INSERT INTO file(
+    id, path, language, modification_time, indexed, complete, line_count
+) VALUES(?, ?, ?, ?, ?, ?, ?);"""
+
+_SQL_FILE_DROP = """
+DROP TABLE IF EXISTS file;"""
+
+_SQL_FILE_DELETE = """
+DELETE FROM file WHERE id = ?;"""
+
+_SQL_FILE_DELETE_MANY = """
+DELETE FROM file WHERE id IN (SELECT value FROM json_each(?));"""
+
+_SQL_FILE_CLEAR = """
+DELETE FROM file;"""
+
+_SQL_FILE_COUNT = """
+SELECT COUNT(*) FROM file;"""
+
+_SQL_FILE_GET = """
+SELECT id, path, language, modification_time, indexed, complete, line_count FROM file WHERE id = ?;"""
+
+_SQL_FILE_GET_MANY = """
+SELECT
+    id, path, language, modification_time, indexed, complete, line_count
+FROM file WHERE id IN (SELECT value FROM json_each(?));"""
+
+_SQL_FILE_UPDATE = """
+UPDATE file SET
+    path = ?,
+    language = ?,
+    modification_time = ?,
+    indexed = ?,
+    complete = ?,
+    line_count = ?
+WHERE
+    id = ?;"""
+
+_SQL_FILE_LIST = """
+SELECT id, path, language, modification_time, indexed, complete, line_count FROM file;"""
+
+
+class FileDAO(TableDAO[File]):
+    """
+    This class is a static class that can manipulate File objects,
+    inserting and removing them from a sqlite database.
+    """
+
+    _SQL_CREATE = _SQL_FILE_CREATE
+    _SQL_DROP = _SQL_FILE_DROP
+    _SQL_INSERT = _SQL_FILE_INSERT
+    _SQL_DELETE = _SQL_FILE_DELETE
+    _SQL_DELETE_MANY = _SQL_FILE_DELETE_MANY
+    _SQL_CLEAR = _SQL_FILE_CLEAR
+    _SQL_COUNT = _SQL_FILE_COUNT
+    _SQL_GET = _SQL_FILE_GET
+    _SQL_UPDATE = _SQL_FILE_UPDATE
+    _SQL_LIST = _SQL_FILE_LIST
+
+    @staticmethod
+    def _to_row(obj: File) -> tuple:
+        return (obj.id, obj.path, obj.language, obj.modification_time, obj.indexed, obj.complete, obj.line_count)
+
+    @staticmethod
+    def _from_row(row: tuple) -> File:
+        return File(*row)
+
+    @staticmethod
+    def new_columns(
+        database: sqlite3.Connection,
+        ids: Iterable[int],
+        paths: Iterable[str],
+        languages: Iterable[str],
+        modification_times: Iterable[str],
+        indexed: Iterable[bool],
+        complete: Iterable[bool],
+        line_counts: Iterable[int],
+    ) -> int:
         """
-        Create the symbol table of the Sourcetrail database
-        if it doesn't exist.
+        Insert many Files inside the file table from columnar data. The
+        rows are assembled by `zip` while sqlite consumes them, so no
+        File object nor intermediate list is built.
         :param database: A database handle
-        :return: None
+        :param ids: The ids of the files
+        :param paths: The paths of the files
+        :param languages: The languages of the files
+        :param modification_times: The modification times of the files
+        :param indexed: Whether each file is indexed
+        :param complete: Whether each file is complete
+        :param line_counts: The number of lines of each file
+        :return: The number of inserted files
         """
-        SqliteHelper.exec(
+        return SqliteHelper.exec_many(
             database,
-            """    
-            CREATE TABLE symbol(
-                id INTEGER NOT NULL, 
-                definition_kind INTEGER NOT NULL, 
-                PRIMARY KEY(id), 
-                FOREIGN KEY(id) REFERENCES node(id) ON DELETE CASCADE
-            );""",
+            _SQL_FILE_INSERT,
+            zip(ids, paths, languages, modification_times, indexed, complete, line_counts),
         )
 
     @staticmethod
-    def delete_table(database: sqlite3.Connection) -> None:
+    def get_many(database: sqlite3.Connection, elem_ids: Iterable[int]) -> dict[int, File]:
         """
-        Delete the symbol table of the Sourcetrail database
-        only if it exists.
+        Return the files from the database matching the given ids, using
+        a single request whatever the number of ids. The ids are bound as
+        one JSON array so the request text stays the same.
         :param database: A database handle
-        :return: None
+        :param elem_ids: The ids of the files to retrieve
+        :return: A dict mapping the id of each file found to its File
+        object, ids that do not match any file are left out
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DROP TABLE IF EXISTS main.symbol;""",
-        )
+        rows = SqliteHelper.fetch(database, _SQL_FILE_GET_MANY, (json.dumps(list(elem_ids)),))
+        return {row[0]: File(*row) for row in rows}
 
-    @staticmethod
-    def new(database: sqlite3.Connection, obj: Symbol) -> int:
-        """
-        Insert a new Symbol inside the symbol table.
-        :param database: A database handle
-        :param obj: The object to insert
-        :return: The id of the inserted symbol
-        """
-        return SqliteHelper.exec(
-            database,
-            """
-            INSERT INTO symbol(
-                id, definition_kind 
-            ) VALUES(?, ?);""",
-            (obj.id, obj.definition_kind.value),
-        )
 
-    @staticmethod
-    def delete(database: sqlite3.Connection, obj: Symbol) -> None:
-        """
-        Delete a Symbol from the symbol table.
-        :param database: A database handle
-        :param obj: The object to delete
-        :return: None
-        """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM symbol WHERE id = ?;""",
-            (obj.id,),
-        )
+_SQL_FILE_CONTENT_CREATE = """
+CREATE TABLE filecontent(
+    id INTEGER,
+    content TEXT,
+    PRIMARY KEY(id),
+    FOREIGN KEY(id) REFERENCES file(id)ON DELETE CASCADE ON UPDATE CASCADE
+);"""
 
-    @staticmethod
-    def clear(database: sqlite3.Connection) -> None:
-        """
-        Delete all Symbols from the symbol table.
-        :param database: A database handle
-        :return: None
-        """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM symbol;""",
-        )
+_SQL_FILE_CONTENT_INSERT = """
+INSERT INTO filecontent(id, content) VALUES(?, ?);"""
 
-    @staticmethod
-    def get(database: sqlite3.Connection, elem_id: int) -> Symbol:
-        """
-        Return a symbol from the database with the matching id
-        :param database: A database handle
-        :param elem_id: The id of the symbol to retrieve
-        :return: A Symbol object that reflect the content inside
-        the database
-        """
-        out = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM symbol WHERE id = ?;""",
-            (elem_id,),
-        )
+_SQL_FILE_CONTENT_DROP = """
+DROP TABLE IF EXISTS filecontent;"""
 
-        if len(out) == 1:
-            id_, type_ = out[0]
-            return Symbol(id_, SymbolType(type_))
+_SQL_FILE_CONTENT_DELETE = """
+DELETE FROM filecontent WHERE id = ?;"""
 
-    @staticmethod
-    def update(database: sqlite3.Connection, obj: Symbol) -> None:
-        """
-        Update a Symbol inside the symbol table.
-        :param database: A database handle
-        :param obj: The Symbol object to update
-        :return: None
-        """
-        SqliteHelper.exec(
-            database,
-            """
-            UPDATE symbol SET
-                definition_kind = ?
-            WHERE
-                id = ?;""",
-            (obj.definition_kind.value, obj.id),
-        )
+_SQL_FILE_CONTENT_DELETE_MANY = """
+DELETE FROM filecontent WHERE id IN (SELECT value FROM json_each(?));"""
 
-    @staticmethod
-    def list(database: sqlite3.Connection) -> list[Symbol]:
-        """
-        Return the list of all the symbols from the symbol table.
-        :param database: A database handle
-        :return: The list of Symbols
-        """
-        rows = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM symbol;""",
-        )
+_SQL_FILE_CONTENT_CLEAR = """
+DELETE FROM filecontent;"""
+
+_SQL_FILE_CONTENT_COUNT = """
+SELECT COUNT(*) FROM filecontent;"""
 
-        result = list()
-        for row in rows:
-            id_, type_ = row
-            result.append(Symbol(id_, SymbolType(type_)))
+_SQL_FILE_CONTENT_GET = """
+SELECT id, content FROM filecontent WHERE id = ?;"""
 
-        return result
+_SQL_FILE_CONTENT_UPDATE = """
+UPDATE filecontent SET
+    content = ?
+WHERE
+    id = ?;"""
 
+_SQL_FILE_CONTENT_LIST = """
+SELECT id, content FROM filecontent;"""
 
-class FileDAO(object):
+
+class FileContentDAO(TableDAO[FileContent]):
     """
-    This class is a static class that can manipulate File objects,
+    This class is a static class that can manipulate FileContent objects,
     inserting and removing them from a sqlite database.
     """
 
-    @staticmethod
-    def create_table(database: sqlite3.Connection) -> None:
-        """
-        Create the file table of the Sourcetrail database
-        if it doesn't exist.
-        :param database: A database handle
-        :return: None
-        """
-        SqliteHelper.exec(
-            database,
-            """    
-            CREATE TABLE file(
-                id INTEGER NOT NULL, 
-                path TEXT, 
-                language TEXT, 
-                modification_time TEXT, 
-                indexed INTEGER, 
-                complete INTEGER, 
-                line_count INTEGER, 
-                PRIMARY KEY(id), 
-                FOREIGN KEY(id) REFERENCES node(id) ON DELETE CASCADE
-            );""",
-        )
-
-    @staticmethod
-    def delete_table(database: sqlite3.Connection) -> None:
-        """
-        Delete the file table of the Sourcetrail database
-        only if it exists.
-        :param database: A database handle
-        :return: None
-        """
-        SqliteHelper.exec(
-            database,
-            """
-            DROP TABLE IF EXISTS main.file;""",
-        )
+    _SQL_CREATE = _SQL_FILE_CONTENT_CREATE
+    _SQL_DROP = _SQL_FILE_CONTENT_DROP
+    _SQL_INSERT = _SQL_FILE_CONTENT_INSERT
+    _SQL_DELETE = _SQL_FILE_CONTENT_DELETE
+    _SQL_DELETE_MANY = _SQL_FILE_CONTENT_DELETE_MANY
+    _SQL_CLEAR = _SQL_FILE_CONTENT_CLEAR
+    _SQL_COUNT = _SQL_FILE_CONTENT_COUNT
+    _SQL_GET = _SQL_FILE_CONTENT_GET
+    _SQL_UPDATE = _SQL_FILE_CONTENT_UPDATE
+    _SQL_LIST = _SQL_FILE_CONTENT_LIST
 
     @staticmethod
-    def new(database: sqlite3.Connection, obj: File) -> int:
-        """
-        Insert a new File inside the file table.
-        :param database: A database handle
-        :param obj: The object to insert
-        :return: The id of the inserted file
-        """
-        return SqliteHelper.exec(
-            database,
-            """
-            INSERT INTO file(
-                id, path, language, modification_time, indexed, complete, line_count 
-            ) VALUES(?, ?, ?, ?, ?, ?, ?);""",
-            (obj.id, obj.path, obj.language, obj.modification_time, obj.indexed, obj.complete, obj.line_count),
-        )
+    def _to_row(obj: FileContent) -> tuple:
+        return (obj.id, obj.content)
 
     @staticmethod
-    def delete(database: sqlite3.Connection, obj: File) -> None:
-        """
-        Delete a File from the file table.
-        :param database: A database handle
-        :param obj: The object to delete
-        :return: None
-        """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM file WHERE id = ?;""",
-            (obj.id,),
-        )
+    def _from_row(row: tuple) -> FileContent:
+        return FileContent(*row)
 
-    @staticmethod
-    def clear(database: sqlite3.Connection) -> None:
-        """
-        Delete all Files from the file table.
-        :param database: A database handle
-        :return: None
-        """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM file;""",
-        )
 
-    @staticmethod
-    def get(database: sqlite3.Connection, elem_id: int) -> File:
-        """
-        Return a file from the database with the matching id
-        :param database: A database handle
-        :param elem_id: The id of the file to retrieve
-        :return: A File object that reflect the content inside
-        the database
-        """
-        out = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM file WHERE id = ?;""",
-            (elem_id,),
-        )
+_SQL_NODE_FILE_CREATE = """
+CREATE TABLE node_file(
+    file_id INTEGER NOT NULL,
+    file_name TEXT,
+    display_content INTEGER,
+    PRIMARY KEY(file_id),
+    FOREIGN KEY(file_id) REFERENCES node(id) ON DELETE CASCADE
+);"""
 
-        if len(out) == 1:
-            return File(*out[0])
+_SQL_NODE_FILE_DROP = """
+DROP TABLE IF EXISTS node_file;"""
 
-    @staticmethod
-    def update(database: sqlite3.Connection, obj: File) -> None:
-        """
-        Update a File inside the file table.
-        :param database: A database handle
-        :param obj: The File object to update
-        :return: None
-        """
-        SqliteHelper.exec(
-            database,
-            """
-            UPDATE file SET
-                path = ?,
-                language = ?,
-                modification_time = ?,
-                indexed = ?,
-                complete = ?,
-                line_count = ? 
-            WHERE
-                id = ?;""",
-            (obj.path, obj.language, obj.modification_time, obj.indexed, obj.complete, obj.line_count, obj.id),
-        )
+_SQL_NODE_FILE_INSERT = """
+INSERT INTO node_file(
+    file_id, file_name, display_content
+) VALUES(?, ?, ?);"""
 
-    @staticmethod
-    def list(database: sqlite3.Connection) -> list[File]:
-        """
-        Return the list of all the files from the file table.
-        :param database: A database handle
-        :return: The list of Files
-        """
-        rows = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM file;""",
-        )
+_SQL_NODE_FILE_DELETE = """
+DELETE FROM node_file WHERE file_id = ?;"""
 
-        result = list()
-        for row in rows:
-            result.append(File(*row))
+_SQL_NODE_FILE_DELETE_MANY = """
+DELETE FROM node_file WHERE file_id IN (SELECT value FROM json_each(?));"""
 
-        return result
+_SQL_NODE_FILE_CLEAR = """
+DELETE FROM node_file;"""
 
 
-class FileContentDAO(object):
+class NodeFileDAO(object):
     """
-    This class is a static class that can manipulate FileContent objects,
+    This class is a static class that can manipulate NodeFile objects,
     inserting and removing them from a sqlite database.
     """
 
     @staticmethod
     def create_table(database: sqlite3.Connection) -> None:
         """
-        Create the filecontent table of the Sourcetrail database
-        if it doesn't exist.
+        Create the node_file table of the Sourcetrail database if it doesn't exist.
+
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """    
-            CREATE TABLE filecontent(
-                id INTEGER, 
-                content TEXT, 
-                PRIMARY KEY(id), 
-                FOREIGN KEY(id) REFERENCES file(id)ON DELETE CASCADE ON UPDATE CASCADE
-            );""",
-        )
+        SqliteHelper.exec(database, _SQL_NODE_FILE_CREATE)
 
     @staticmethod
     def delete_table(database: sqlite3.Connection) -> None:
         """
-        Delete the filecontent table of the Sourcetrail database
-        only if it exists.
+        Delete the node_file table of the Sourcetrail database if it exists.
+
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DROP TABLE IF EXISTS main.filecontent;""",
-        )
+        SqliteHelper.exec(database, _SQL_NODE_FILE_DROP)
 
     @staticmethod
-    def new(database: sqlite3.Connection, obj: FileContent) -> int:
+    def new(database: sqlite3.Connection, obj: NodeFile) -> int:
         """
-        Insert a new FileContent inside the filecontent table.
+        Insert a new NodeFile inside the node_file table.
         :param database: A database handle
         :param obj: The object to insert
-        :return: The id of the inserted filecontent
+        :return: The id of the inserted node_file
         """
-        return SqliteHelper.exec(
-            database,
-            """
-            INSERT INTO filecontent(
-                id, content 
-            ) VALUES(?, ?);""",
-            (obj.id, obj.content),
-        )
+        return SqliteHelper.exec(database, _SQL_NODE_FILE_INSERT, (obj.id, obj.file_name, int(obj.display_content)))
 
     @staticmethod
-    def delete(database: sqlite3.Connection, obj: FileContent) -> None:
+    def new_many(database: sqlite3.Connection, objs: Iterable[NodeFile]) -> int:
         """
-        Delete an FileContent from the filecontent table.
+        Insert many NodeFiles inside the node_file table with a single request.
         :param database: A database handle
-        :param obj: The object to delete
-        :return: None
+        :param objs: The objects to insert
+        :return: The number of inserted node_files
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM filecontent WHERE id = ?;""",
-            (obj.id,),
+        return SqliteHelper.exec_many(
+            database, _SQL_NODE_FILE_INSERT, ((obj.id, obj.file_name, int(obj.display_content)) for obj in objs)
         )
 
     @staticmethod
-    def clear(database: sqlite3.Connection) -> None:
+    def delete(database: sqlite3.Connection, obj: NodeFile) -> None:
         """
-        Delete all FileContents from the filecontent table.
+        Delete an NodeFile from the node_file table.
         :param database: A database handle
+        :param obj: The object to delete
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM filecontent;""",
-        )
+        SqliteHelper.exec(database, _SQL_NODE_FILE_DELETE, (obj.id,))
 
     @staticmethod
-    def get(database: sqlite3.Connection, elem_id: int) -> FileContent:
+    def delete_many(database: sqlite3.Connection, elem_ids: Iterable[int]) -> None:
         """
-        Return a filecontent from the database with the matching id
+        Delete the NodeFiles matching the given file ids from the node_file
+        table with a single request, whatever the number of ids.
         :param database: A database handle
-        :param elem_id: The id of the filecontent to retrieve
-        :return: A FileContent object that reflect the content inside
-        the database
+        :param elem_ids: The ids of the files to delete
+        :return: None
         """
-        out = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM filecontent WHERE id = ?;""",
-            (elem_id,),
-        )
-
-        if len(out) == 1:
-            return FileContent(*out[0])
+        SqliteHelper.exec(database, _SQL_NODE_FILE_DELETE_MANY, (json.dumps(list(elem_ids)),))
 
     @staticmethod
-    def update(database: sqlite3.Connection, obj: FileContent) -> None:
+    def clear(database: sqlite3.Connection) -> None:
         """
-        Update an FileContent inside the filecontent table.
+        Delete all NodeFiles from the node_file table.
         :param database: A database handle
-        :param obj: The FileContent object to update
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            UPDATE filecontent SET
-                content = ? 
-            WHERE
-                id = ?;""",
-            (obj.content, obj.id),
-        )
+        SqliteHelper.exec(database, _SQL_NODE_FILE_CLEAR)
 
-    @staticmethod
-    def list(database: sqlite3.Connection) -> list[FileContent]:
-        """
-        Return the list of all the filecontents from the filecontent table.
-        :param database: A database handle
-        :return: The list of FileContents
-        """
-        rows = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM filecontent;""",
-        )
 
-        result = list()
-        for row in rows:
-            result.append(FileContent(*row))
+_SQL_LOCAL_SYMBOL_CREATE = """
+CREATE TABLE local_symbol(
+    id INTEGER NOT NULL,
+    name TEXT,
+    PRIMARY KEY(id),
+    FOREIGN KEY(id) REFERENCES element(id) ON DELETE CASCADE
+);"""
 
-        return result
+# Local symbols are looked up by name each time one is recorded, the
+# index covers the whole lookup so the table itself is never read
+_SQL_LOCAL_SYMBOL_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_local_symbol_name ON local_symbol(name, id);"""
 
+_SQL_LOCAL_SYMBOL_INSERT = """
+INSERT INTO local_symbol(id, name) VALUES(?, ?);"""
 
-class NodeFileDAO(object):
-    """
-    This class is a static class that can manipulate NodeFile objects,
-    inserting and removing them from a sqlite database.
-    """
+_SQL_LOCAL_SYMBOL_DROP = """
+DROP TABLE IF EXISTS local_symbol;"""
 
-    @staticmethod
-    def create_table(database: sqlite3.Connection) -> None:
-        """
-        Create the node_file table of the Sourcetrail database if it doesn't exist.
+_SQL_LOCAL_SYMBOL_DELETE = """
+DELETE FROM local_symbol WHERE id = ?;"""
 
-        :param database: A database handle
-        :return: None
-        """
-        SqliteHelper.exec(
-            database,
-            """
-            CREATE TABLE node_file(
-                file_id INTEGER NOT NULL,
-                file_name TEXT,
-                display_content INTEGER, 
-                PRIMARY KEY(file_id),
-                FOREIGN KEY(file_id) REFERENCES node(id) ON DELETE CASCADE
-            );""",
-        )
+_SQL_LOCAL_SYMBOL_DELETE_MANY = """
+DELETE FROM local_symbol WHERE id IN (SELECT value FROM json_each(?));"""
 
-    @staticmethod
-    def delete_table(database: sqlite3.Connection) -> None:
-        """
-        Delete the node_file table of the Sourcetrail database if it exists.
+_SQL_LOCAL_SYMBOL_CLEAR = """
+DELETE FROM local_symbol;"""
 
-        :param database: A database handle
-        :return: None
-        """
-        SqliteHelper.exec(
-            database,
-            """
-            DROP TABLE IF EXISTS node_file;""",
-        )
+_SQL_LOCAL_SYMBOL_COUNT = """
+SELECT COUNT(*) FROM local_symbol;"""
 
-    @staticmethod
-    def new(database: sqlite3.Connection, obj: NodeFile) -> int:
-        """
-        Insert a new NodeFile inside the node_file table.
-        :param database: A database handle
-        :param obj: The object to insert
-        :return: The id of the inserted node_file
-        """
-        return SqliteHelper.exec(
-            database,
-            """
-            INSERT INTO node_file(
-                file_id, file_name, display_content
-            ) VALUES(?, ?, ?);""",
-            (obj.id, obj.file_name, int(obj.display_content)),
-        )
+_SQL_LOCAL_SYMBOL_GET = """
+SELECT id, name FROM local_symbol WHERE id = ?;"""
 
-    @staticmethod
-    def delete(database: sqlite3.Connection, obj: NodeFile) -> None:
-        """
-        Delete an NodeFile from the node_file table.
-        :param database: A database handle
-        :param obj: The object to delete
-        :return: None
-        """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM node_file WHERE file_id = ?;""",
-            (obj.id,),
-        )
+_SQL_LOCAL_SYMBOL_GET_FROM_NAME = """
+SELECT id, name FROM local_symbol WHERE name = ? LIMIT 1;"""
 
-    @staticmethod
-    def clear(database: sqlite3.Connection) -> None:
-        """
-        Delete all NodeFiles from the node_file table.
-        :param database: A database handle
-        :return: None
-        """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM node_file;""",
-        )
+_SQL_LOCAL_SYMBOL_UPDATE = """
+UPDATE local_symbol SET
+    name = ?
+WHERE
+    id = ?;"""
+
+_SQL_LOCAL_SYMBOL_LIST = """
+SELECT id, name FROM local_symbol;"""
 
 
-class LocalSymbolDAO(object):
+class LocalSymbolDAO(TableDAO[LocalSymbol]):
     """
     This class is a static class that can manipulate LocalSymbol objects,
     inserting and removing them from a sqlite database.
+
+    Since indexers resolve the same local symbols by name over and over,
+    the results of `get_from_name` are cached on the connection and
+    invalidated by every method modifying the table.
     """
 
+    _SQL_CREATE = _SQL_LOCAL_SYMBOL_CREATE
+    _SQL_DROP = _SQL_LOCAL_SYMBOL_DROP
+    _SQL_INSERT = _SQL_LOCAL_SYMBOL_INSERT
+    _SQL_DELETE = _SQL_LOCAL_SYMBOL_DELETE
+    _SQL_DELETE_MANY = _SQL_LOCAL_SYMBOL_DELETE_MANY
+    _SQL_CLEAR = _SQL_LOCAL_SYMBOL_CLEAR
+    _SQL_COUNT = _SQL_LOCAL_SYMBOL_COUNT
+    _SQL_GET = _SQL_LOCAL_SYMBOL_GET
+    _SQL_UPDATE = _SQL_LOCAL_SYMBOL_UPDATE
+    _SQL_LIST = _SQL_LOCAL_SYMBOL_LIST
+
     @staticmethod
-    def create_table(database: sqlite3.Connection) -> None:
+    def _to_row(obj: LocalSymbol) -> tuple:
+        return (obj.id, obj.name)
+
+    @staticmethod
+    def _from_row(row: tuple) -> LocalSymbol:
+        return LocalSymbol(*row)
+
+    @staticmethod
+    def names(database: sqlite3.Connection) -> dict[str, LocalSymbol]:
         """
-        Create the local_symbol table of the Sourcetrail database
-        if it doesn't exist.
+        Return the cache of the local symbols already resolved by name on
+        this connection. Connections that were not opened with
+        SqliteHelper.connect get an empty dict that is not kept.
+        :param database: A database handle
+        :return: A dict mapping the names to their LocalSymbol
+        """
+        return getattr(database, "local_symbols", {})
+
+    @classmethod
+    def create_table(cls, database: sqlite3.Connection) -> None:
+        """
+        Create the local_symbol table of the Sourcetrail database, and its
+        index on the names, if they don't exist.
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """    
-            CREATE TABLE local_symbol(
-                id INTEGER NOT NULL, 
-                name TEXT, 
-                PRIMARY KEY(id), 
-                FOREIGN KEY(id) REFERENCES element(id) ON DELETE CASCADE
-            );""",
-        )
+        super().create_table(database)
+        SqliteHelper.exec(database, _SQL_LOCAL_SYMBOL_INDEX)
 
-    @staticmethod
-    def delete_table(database: sqlite3.Connection) -> None:
+    @classmethod
+    def delete_table(cls, database: sqlite3.Connection) -> None:
         """
         Delete the local_symbol table of the Sourcetrail database
         only if it exists.
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DROP TABLE IF EXISTS main.local_symbol;""",
-        )
+        LocalSymbolDAO.names(database).clear()
+        super().delete_table(database)
 
-    @staticmethod
-    def new(database: sqlite3.Connection, obj: LocalSymbol) -> int:
+    @classmethod
+    def new(cls, database: sqlite3.Connection, obj: LocalSymbol) -> int:
         """
         Insert a new LocalSymbol inside the local_symbol table.
         :param database: A database handle
         :param obj: The object to insert
         :return: The id of the inserted local_symbol
         """
-        return SqliteHelper.exec(
-            database,
-            """
-            INSERT INTO local_symbol(
-                id, name 
-            ) VALUES(?, ?);""",
-            (obj.id, obj.name),
-        )
+        LocalSymbolDAO.names(database).pop(obj.name, None)
+        return super().new(database, obj)
 
-    @staticmethod
-    def delete(database: sqlite3.Connection, obj: LocalSymbol) -> None:
+    @classmethod
+    def new_many(cls, database: sqlite3.Connection, objs: Iterable[LocalSymbol]) -> int:
         """
-        Delete an LocalSymbol from the local_symbol table.
+        Insert many LocalSymbols inside the local_symbol table with a single request.
         :param database: A database handle
-        :param obj: The object to delete
-        :return: None
+        :param objs: The objects to insert
+        :return: The number of inserted local_symbols
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM local_symbol WHERE id = ?;""",
-            (obj.id,),
-        )
+        LocalSymbolDAO.names(database).clear()
+        return super().new_many(database, objs)
 
-    @staticmethod
-    def clear(database: sqlite3.Connection) -> None:
+    @classmethod
+    def delete(cls, database: sqlite3.Connection, obj: LocalSymbol) -> None:
         """
-        Delete all LocalSymbols from the local_symbol table.
+        Delete an LocalSymbol from the local_symbol table.
         :param database: A database handle
+        :param obj: The object to delete
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM local_symbol;""",
-        )
+        LocalSymbolDAO.names(database).clear()
+        super().delete(database, obj)
 
-    @staticmethod
-    def get(database: sqlite3.Connection, elem_id: int) -> LocalSymbol:
+    @classmethod
+    def delete_many(cls, database: sqlite3.Connection, elem_ids: Iterable[int]) -> None:
         """
-        Return a local_symbol from the database with the matching id
+        Delete the LocalSymbols matching the given ids from the local_symbol table.
         :param database: A database handle
-        :param elem_id: The id of the local_symbol to retrieve
-        :return: A LocalSymbol object that reflect the content inside
-        the database
+        :param elem_ids: The ids of the local_symbols to delete
+        :return: None
         """
-        out = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM local_symbol WHERE id = ?;""",
-            (elem_id,),
-        )
+        LocalSymbolDAO.names(database).clear()
+        super().delete_many(database, elem_ids)
 
-        if len(out) == 1:
-            return LocalSymbol(*out[0])
-
-    @staticmethod
-    def get_from_name(database: sqlite3.Connection, name: str) -> LocalSymbol:
+    @classmethod
+    def clear(cls, database: sqlite3.Connection) -> None:
         """
-        Return a local_symbol from the database with the matching name
+        Delete all LocalSymbols from the local_symbol table.
         :param database: A database handle
-        :param name: The name of the local_symbol to retrieve
-        :return: A LocalSymbol object that reflect the content inside
-        the database
+        :return: None
         """
-        out = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM local_symbol WHERE name = ? LIMIT 1;""",
-            (name,),
-        )
-
-        if len(out) == 1:
-            return LocalSymbol(*out[0])
+        LocalSymbolDAO.names(database).clear()
+        super().clear(database)
 
-    @staticmethod
-    def update(database: sqlite3.Connection, obj: LocalSymbol) -> None:
+    @classmethod
+    def update(cls, database: sqlite3.Connection, obj: LocalSymbol) -> None:
         """
         Update an LocalSymbol inside the local_symbol table.
         :param database: A database handle
         :param obj: The LocalSymbol object to update
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            UPDATE local_symbol SET
-                name = ? 
-            WHERE
-                id = ?;""",
-            (obj.name, obj.id),
-        )
+        LocalSymbolDAO.names(database).clear()
+        super().update(database, obj)
 
-    @staticmethod
-    def list(database: sqlite3.Connection) -> list[LocalSymbol]:
+    @classmethod
+    def update_many(cls, database: sqlite3.Connection, objs: Iterable[LocalSymbol]) -> int:
         """
-        Return the list of all the local_symbols from the local_symbol table.
+        Update many LocalSymbols inside the local_symbol table with a single request.
         :param database: A database handle
-        :return: The list of LocalSymbols
+        :param objs: The LocalSymbol objects to update
+        :return: The number of updated local_symbols
         """
-        rows = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM local_symbol;""",
-        )
-
-        result = list()
-        for row in rows:
-            result.append(LocalSymbol(*row))
-
-        return result
-
-
-class SourceLocationDAO(object):
-    """
-    This class is a static class that can manipulate SourceLocation objects,
-    inserting and removing them from a sqlite database.
-    """
+        LocalSymbolDAO.names(database).clear()
+        return super().update_many(database, objs)
 
     @staticmethod
-    def create_table(database: sqlite3.Connection) -> None:
-        """
-        Create the source_location table of the Sourcetrail database
-        if it doesn't exist.
-        :param database: A database handle
-        :return: None
-        """
-        SqliteHelper.exec(
-            database,
-            """    
-            CREATE TABLE source_location(
-                id INTEGER NOT NULL, 
-                file_node_id INTEGER, 
-                start_line INTEGER, 
-                start_column INTEGER, 
-                end_line INTEGER, 
-                end_column INTEGER, 
-                type INTEGER, 
-                PRIMARY KEY(id), 
-                FOREIGN KEY(file_node_id) REFERENCES node(id) ON DELETE CASCADE
-            );""",
-        )
-
-    @staticmethod
-    def delete_table(database: sqlite3.Connection) -> None:
+    def get_from_name(database: sqlite3.Connection, name: str) -> LocalSymbol:
         """
-        Delete the source_location table of the Sourcetrail database
-        only if it exists.
+        Return a local_symbol from the database with the matching name
         :param database: A database handle
-        :return: None
+        :param name: The name of the local_symbol to retrieve
+        :return: A LocalSymbol object that reflect the content inside
+        the database
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DROP TABLE IF EXISTS main.source_location;""",
-        )
+        names = LocalSymbolDAO.names(database)
+        local = names.get(name)
+        if local is not None:
+            return local
+
+        row = SqliteHelper.fetch_one(database, _SQL_LOCAL_SYMBOL_GET_FROM_NAME, (name,))
+        if row:
+            local = names[name] = LocalSymbol(*row)
+            return local
+
+
+_SQL_SOURCE_LOCATION_CREATE = """
+CREATE TABLE source_location(
+    id INTEGER NOT NULL,
+    file_node_id INTEGER,
+    start_line INTEGER,
+    start_column INTEGER,
+    end_line INTEGER,
+    end_column INTEGER,
+    type INTEGER,
+    PRIMARY KEY(id),
+    FOREIGN KEY(file_node_id) REFERENCES node(id) ON DELETE CASCADE
+);"""
+
+_SQL_SOURCE_LOCATION_INSERT = """
+INSERT INTO source_location(
+    id, file_node_id, start_line, start_column, end_line, end_column, type
+) VALUES(NULL, ?, ?, ?, ?, ?, ?);"""
+
+_SQL_SOURCE_LOCATION_INSERT_RETURNING = """
+INSERT INTO source_location(
+    id, file_node_id, start_line, start_column, end_line, end_column, type
+) VALUES(NULL, ?, ?, ?, ?, ?, ?) RETURNING id;"""
+
+# The rows to insert are bound as a single JSON array of arrays, so any
+# number of them can be inserted, and their ids returned, in one request
+_SQL_SOURCE_LOCATION_INSERT_JSON = """
+INSERT INTO source_location(
+    file_node_id, start_line, start_column, end_line, end_column, type
+) SELECT
+    json_extract(value, '$[0]'),
+    json_extract(value, '$[1]'),
+    json_extract(value, '$[2]'),
+    json_extract(value, '$[3]'),
+    json_extract(value, '$[4]'),
+    json_extract(value, '$[5]')
+FROM json_each(?) ORDER BY key RETURNING id;"""
+
+_SQL_SOURCE_LOCATION_DROP = """
+DROP TABLE IF EXISTS source_location;"""
+
+_SQL_SOURCE_LOCATION_DELETE = """
+DELETE FROM source_location WHERE id = ?;"""
+
+_SQL_SOURCE_LOCATION_DELETE_MANY = """
+DELETE FROM source_location WHERE id IN (SELECT value FROM json_each(?));"""
+
+_SQL_SOURCE_LOCATION_CLEAR = """
+DELETE FROM source_location;"""
+
+_SQL_SOURCE_LOCATION_COUNT = """
+SELECT COUNT(*) FROM source_location;"""
+
+_SQL_SOURCE_LOCATION_GET = """
+SELECT
+    id, file_node_id, start_line, start_column, end_line, end_column, type
+FROM source_location WHERE id = ?;"""
+
+_SQL_SOURCE_LOCATION_GET_MANY = """
+SELECT
+    id, file_node_id, start_line, start_column, end_line, end_column, type
+FROM source_location WHERE id IN (SELECT value FROM json_each(?));"""
+
+_SQL_SOURCE_LOCATION_UPDATE = """
+UPDATE source_location SET
+    file_node_id = ?,
+    start_line = ?,
+    start_column = ?,
+    end_line = ?,
+    end_column = ?,
+    type = ?
+WHERE
+    id = ?;"""
+
+_SQL_SOURCE_LOCATION_LIST = """
+SELECT id, file_node_id, start_line, start_column, end_line, end_column, type FROM source_location;"""
+
+
+class SourceLocationDAO(TableDAO[SourceLocation]):
+    """
+    This class is a static class that can manipulate SourceLocation objects,
+    inserting and removing them from a sqlite database.
+    """
 
-    @staticmethod
-    def new(database: sqlite3.Connection, obj: SourceLocation) -> int:
-        """
-        Insert a new SourceLocation inside the source_location table.
-        :param database: A database handle
-        :param obj: The object to insert
-        :return: The id of the inserted source_location
-        """
-        return SqliteHelper.exec(
-            database,
-            """
-            INSERT INTO source_location(
-                id, file_node_id, start_line, start_column, end_line, end_column, type 
-            ) VALUES(NULL, ?, ?, ?, ?, ?, ?);""",
-            (obj.file_node_id, obj.start_line, obj.start_column, obj.end_line, obj.end_column, obj.type.value),
-        )
+    _SQL_CREATE = _SQL_SOURCE_LOCATION_CREATE
+    _SQL_DROP = _SQL_SOURCE_LOCATION_DROP
+    _SQL_INSERT = _SQL_SOURCE_LOCATION_INSERT
+    _SQL_DELETE = _SQL_SOURCE_LOCATION_DELETE
+    _SQL_DELETE_MANY = _SQL_SOURCE_LOCATION_DELETE_MANY
+    _SQL_CLEAR = _SQL_SOURCE_LOCATION_CLEAR
+    _SQL_COUNT = _SQL_SOURCE_LOCATION_COUNT
+    _SQL_GET = _SQL_SOURCE_LOCATION_GET
+    _SQL_UPDATE = _SQL_SOURCE_LOCATION_UPDATE
+    _SQL_LIST = _SQL_SOURCE_LOCATION_LIST
 
     @staticmethod
-    def delete(database: sqlite3.Connection, obj: SourceLocation) -> None:
-        """
-        Delete an SourceLocation from the source_location table.
-        :param database: A database handle
-        :param obj: The object to delete
-        :return: None
-        """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM source_location WHERE id = ?;""",
-            (obj.id,),
+    def _to_row(obj: SourceLocation) -> tuple:
+        return (
+            obj.id,
+            obj.file_node_id,
+            obj.start_line,
+            obj.start_column,
+            obj.end_line,
+            obj.end_column,
+            obj.type,
         )
 
     @staticmethod
-    def clear(database: sqlite3.Connection) -> None:
+    def _from_row(row: tuple) -> SourceLocation:
+        id_, fid, sl, sc, el, ec, type_ = row
+        return SourceLocation(id_, fid, sl, sc, el, ec, _SOURCE_LOCATION_TYPES[type_])
+
+    @classmethod
+    def new(cls, database: sqlite3.Connection, obj: SourceLocation) -> int:
         """
-        Delete all SourceLocations from the source_location table.
+        Insert a new SourceLocation inside the source_location table, its
+        id is generated by the database.
         :param database: A database handle
-        :return: None
+        :param obj: The object to insert
+        :return: The id of the inserted source_location
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM source_location;""",
-        )
+        if _HAS_RETURNING:
+            return SqliteHelper.exec_returning(database, _SQL_SOURCE_LOCATION_INSERT_RETURNING, cls._to_row(obj)[1:])
+        return SqliteHelper.exec(database, _SQL_SOURCE_LOCATION_INSERT, cls._to_row(obj)[1:])
 
-    @staticmethod
-    def get(database: sqlite3.Connection, elem_id: int) -> SourceLocation:
+    @classmethod
+    def new_many(cls, database: sqlite3.Connection, objs: Iterable[SourceLocation]) -> int:
         """
-        Return a source_location from the database with the matching id
+        Insert many SourceLocations inside the source_location table with a
+        single request, their ids are generated by the database.
         :param database: A database handle
-        :param elem_id: The id of the source_location to retrieve
-        :return: A SourceLocation object that reflect the content inside
-        the database
+        :param objs: The objects to insert
+        :return: The number of inserted source_locations
         """
-        out = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM source_location WHERE id = ?;""",
-            (elem_id,),
-        )
-
-        if len(out) == 1:
-            id_, fid, sl, sc, el, ec, type_ = out[0]
-            return SourceLocation(id_, fid, sl, sc, el, ec, SourceLocationType(type_))
+        return SqliteHelper.exec_many(database, _SQL_SOURCE_LOCATION_INSERT, (cls._to_row(obj)[1:] for obj in objs))
 
     @staticmethod
-    def update(database: sqlite3.Connection, obj: SourceLocation) -> None:
+    def new_many_ids(database: sqlite3.Connection, objs: Iterable[SourceLocation]) -> list[int]:
         """
-        Update an SourceLocation inside the source_location table.
+        Insert many SourceLocations inside the source_location table with a
+        single request, returning the ids generated for them.
         :param database: A database handle
-        :param obj: The SourceLocation object to update
-        :return: None
+        :param objs: The objects to insert
+        :return: The ids of the inserted source_locations, in the order of
+        `objs`
+        :raises sqlite3.NotSupportedError: If SQLite is older than 3.35
         """
-        SqliteHelper.exec(
-            database,
-            """
-            UPDATE source_location SET
-                file_node_id = ?,
-                start_line = ?,
-                start_column = ?,
-                end_line = ?,
-                end_column = ?,
-                type = ? 
-            WHERE
-                id = ?;""",
-            (obj.file_node_id, obj.start_line, obj.start_column, obj.end_line, obj.end_column, obj.type.value, obj.id),
-        )
+        if not _HAS_RETURNING:
+            raise sqlite3.NotSupportedError(
+                "new_many_ids requires SQLite 3.35 or later, found %s" % sqlite3.sqlite_version
+            )
+        values = [
+            (obj.file_node_id, obj.start_line, obj.start_column, obj.end_line, obj.end_column, obj.type) for obj in objs
+        ]
+        rows = SqliteHelper.fetch(database, _SQL_SOURCE_LOCATION_INSERT_JSON, (json.dumps(values),))
+        # The order of the rows produced by RETURNING is unspecified, but
+        # the ids are allocated in increasing order as the rows are inserted
+        return sorted(id_ for id_, in rows)
 
     @staticmethod
-    def list(database: sqlite3.Connection) -> list[SourceLocation]:
+    def get_many(database: sqlite3.Connection, elem_ids: Iterable[int]) -> dict[int, SourceLocation]:
         """
-        Return the list of all the source_locations from the source_location table.
+        Return the source_locations from the database matching the given
+        ids, using a single request whatever the number of ids. The ids are
+        bound as one JSON array so the request text stays the same.
         :param database: A database handle
-        :return: The list of SourceLocations
+        :param elem_ids: The ids of the source_locations to retrieve
+        :return: A dict mapping the id of each source_location found to its
+        SourceLocation object, ids that do not match any row are left out
         """
-        rows = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM source_location;""",
-        )
+        rows = SqliteHelper.fetch(database, _SQL_SOURCE_LOCATION_GET_MANY, (json.dumps(list(elem_ids)),))
+        return {
+            id_: SourceLocation(id_, fid, sl, sc, el, ec, _SOURCE_LOCATION_TYPES[type_])
+            for id_, fid, sl, sc, el, ec, type_ in rows
+        }
+
+
+_SQL_OCCURRENCE_CREATE = """
+CREATE TABLE occurrence(
+    element_id INTEGER NOT NULL,
+    source_location_id INTEGER NOT NULL,
+    PRIMARY KEY(element_id, source_location_id),
+    FOREIGN KEY(element_id) REFERENCES element(id) ON DELETE CASCADE,
+    FOREIGN KEY(source_location_id) REFERENCES source_location(id)
+        ON DELETE CASCADE
+);"""
+
+_SQL_OCCURRENCE_INSERT = """
+INSERT INTO occurrence(element_id, source_location_id) VALUES(?, ?);"""
+
+# Staging table used by OccurrenceDAO.new_bulk, private to the connection
+_SQL_OCCURRENCE_STAGING_CREATE = """
+CREATE TEMP TABLE IF NOT EXISTS occurrence_staging(
+    element_id INTEGER NOT NULL,
+    source_location_id INTEGER NOT NULL
+);"""
+
+_SQL_OCCURRENCE_STAGING_INSERT = """
+INSERT INTO occurrence_staging(element_id, source_location_id) VALUES(?, ?);"""
+
+_SQL_OCCURRENCE_STAGING_MERGE = """
+INSERT OR IGNORE INTO occurrence(element_id, source_location_id)
+SELECT element_id, source_location_id FROM occurrence_staging
+ORDER BY element_id, source_location_id;"""
+
+_SQL_OCCURRENCE_STAGING_CLEAR = """
+DELETE FROM occurrence_staging;"""
+
+_SQL_OCCURRENCE_DROP = """
+DROP TABLE IF EXISTS occurrence;"""
+
+_SQL_OCCURRENCE_DELETE = """
+DELETE FROM occurrence WHERE element_id = ? AND source_location_id = ?;"""
 
-        result = list()
-        for row in rows:
-            id_, fid, sl, sc, el, ec, type_ = row
-            result.append(SourceLocation(id_, fid, sl, sc, el, ec, SourceLocationType(type_)))
+_SQL_OCCURRENCE_CLEAR = """
+DELETE FROM occurrence;"""
 
-        return result
+_SQL_OCCURRENCE_GET = """
+SELECT element_id, source_location_id FROM occurrence WHERE element_id = ? LIMIT 1;"""
+
+# The primary key index starts with element_id, no other index is needed
+_SQL_OCCURRENCE_LIST_BY_ELEMENT = """
+SELECT element_id, source_location_id FROM occurrence WHERE element_id = ?;"""
+
+_SQL_OCCURRENCE_LIST = """
+SELECT element_id, source_location_id FROM occurrence;"""
 
 
 class OccurrenceDAO(object):
@@ -1733,18 +2749,7 @@ class OccurrenceDAO(object):
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """    
-            CREATE TABLE occurrence(
-                element_id INTEGER NOT NULL, 
-                source_location_id INTEGER NOT NULL, 
-                PRIMARY KEY(element_id, source_location_id), 
-                FOREIGN KEY(element_id) REFERENCES element(id) ON DELETE CASCADE, 
-                FOREIGN KEY(source_location_id) REFERENCES source_location(id) 
-                    ON DELETE CASCADE
-            );""",
-        )
+        SqliteHelper.exec(database, _SQL_OCCURRENCE_CREATE)
 
     @staticmethod
     def delete_table(database: sqlite3.Connection) -> None:
@@ -1754,11 +2759,7 @@ class OccurrenceDAO(object):
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DROP TABLE IF EXISTS main.occurrence;""",
-        )
+        SqliteHelper.exec(database, _SQL_OCCURRENCE_DROP)
 
     @staticmethod
     def new(database: sqlite3.Connection, obj: Occurrence) -> int:
@@ -1768,15 +2769,44 @@ class OccurrenceDAO(object):
         :param obj: The object to insert
         :return: The id of the inserted occurrence
         """
-        return SqliteHelper.exec(
-            database,
-            """
-            INSERT INTO occurrence(
-                element_id, source_location_id 
-            ) VALUES(?, ?);""",
-            (obj.element_id, obj.source_location_id),
+        return SqliteHelper.exec(database, _SQL_OCCURRENCE_INSERT, (obj.element_id, obj.source_location_id))
+
+    @staticmethod
+    def new_many(database: sqlite3.Connection, objs: Iterable[Occurrence]) -> int:
+        """
+        Insert many Occurrences inside the occurrence table with a single request.
+        :param database: A database handle
+        :param objs: The objects to insert
+        :return: The number of inserted occurrences
+        """
+        return SqliteHelper.exec_many(
+            database, _SQL_OCCURRENCE_INSERT, ((obj.element_id, obj.source_location_id) for obj in objs)
         )
 
+    @staticmethod
+    def new_bulk(database: sqlite3.Connection, pairs: Iterable[tuple[int, int]]) -> int:
+        """
+        Insert a large batch of occurrences. The pairs are first loaded in a
+        temporary staging table, then merged into the occurrence table with
+        a single INSERT ... SELECT sorted on the primary key, so the index
+        is updated in one ordered pass. Occurrences that already exist, or
+        given more than once, are inserted only once. Everything runs in
+        one transaction: called outside of any transaction, the
+        occurrences are committed before returning, otherwise they are
+        only written in a savepoint of the pending transaction.
+        :param database: A database handle
+        :param pairs: The (element_id, source_location_id) pairs to insert
+        :return: The number of inserted occurrences
+        """
+        with SqliteHelper.transaction(database):
+            SqliteHelper.exec(database, _SQL_OCCURRENCE_STAGING_CREATE)
+            SqliteHelper.exec_many(database, _SQL_OCCURRENCE_STAGING_INSERT, pairs)
+            cur = SqliteHelper.cursor(database, _SQL_OCCURRENCE_STAGING_MERGE)
+            cur.execute(_SQL_OCCURRENCE_STAGING_MERGE)
+            count = cur.rowcount
+            SqliteHelper.exec(database, _SQL_OCCURRENCE_STAGING_CLEAR)
+        return count
+
     @staticmethod
     def delete(database: sqlite3.Connection, obj: Occurrence) -> None:
         """
@@ -1785,11 +2815,20 @@ class OccurrenceDAO(object):
         :param obj: The object to delete
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM occurrence WHERE element_id = ?;""",
-            (obj.element_id,),
+        SqliteHelper.exec(database, _SQL_OCCURRENCE_DELETE, (obj.element_id, obj.source_location_id))
+
+    @staticmethod
+    def delete_many(database: sqlite3.Connection, objs: Iterable[Occurrence]) -> None:
+        """
+        Delete many Occurrences from the occurrence table with a single
+        request. An occurrence is identified by a pair of ids, so the pairs
+        are streamed to the request rather than bound as one array.
+        :param database: A database handle
+        :param objs: The objects to delete
+        :return: None
+        """
+        SqliteHelper.exec_many(
+            database, _SQL_OCCURRENCE_DELETE, ((obj.element_id, obj.source_location_id) for obj in objs)
         )
 
     @staticmethod
@@ -1799,11 +2838,7 @@ class OccurrenceDAO(object):
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM occurrence;""",
-        )
+        SqliteHelper.exec(database, _SQL_OCCURRENCE_CLEAR)
 
     @staticmethod
     def get(database: sqlite3.Connection, elem_id: int) -> Occurrence:
@@ -1814,15 +2849,20 @@ class OccurrenceDAO(object):
         :return: A Occurrence object that reflect the content inside
         the database
         """
-        out = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM occurrence WHERE element_id = ?;""",
-            (elem_id,),
-        )
+        row = SqliteHelper.fetch_one(database, _SQL_OCCURRENCE_GET, (elem_id,))
+        if row:
+            return Occurrence(*row)
 
-        if len(out) == 1:
-            return Occurrence(*out[0])
+    @staticmethod
+    def list_by_element(database: sqlite3.Connection, elem_id: int) -> list[Occurrence]:
+        """
+        Return the list of the occurrences of an element, found through the
+        primary key index rather than by scanning the whole table.
+        :param database: A database handle
+        :param elem_id: The id of the element
+        :return: The list of Occurrences of the element
+        """
+        return [Occurrence(*row) for row in SqliteHelper.fetch(database, _SQL_OCCURRENCE_LIST_BY_ELEMENT, (elem_id,))]
 
     @staticmethod
     def update(database: sqlite3.Connection, obj: Occurrence) -> None:
@@ -1832,15 +2872,23 @@ class OccurrenceDAO(object):
         :param obj: The Occurrence object to update
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            UPDATE occurrence SET
-                source_location_id = ? 
-            WHERE
-                element_id = ?;""",
-            (obj.source_location_id, obj.element_id),
-        )
+        # Since the Occurrence object does only contain its (composite)
+        # primary key it can't be updated, delete it and insert a new one
+        # instead
+        pass
+
+    @staticmethod
+    def iter(database: sqlite3.Connection) -> Iterator[Occurrence]:
+        """
+        Iterate over all the occurrences from the occurrence table.
+        The rows are read from the database as the iteration goes, so
+        the whole table is never held in memory.
+        :param database: A database handle
+        :return: An iterator over the Occurrences
+        """
+        for rows in SqliteHelper.fetch_batches(database, _SQL_OCCURRENCE_LIST):
+            for row in rows:
+                yield Occurrence(*row)
 
     @staticmethod
     def list(database: sqlite3.Connection) -> list[Occurrence]:
@@ -1849,307 +2897,216 @@ class OccurrenceDAO(object):
         :param database: A database handle
         :return: The list of Occurrences
         """
-        rows = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM occurrence;""",
-        )
+        return [Occurrence(*row) for row in SqliteHelper.fetch(database, _SQL_OCCURRENCE_LIST)]
+
+
+_SQL_COMPONENT_ACCESS_CREATE = """
+CREATE TABLE component_access(
+    node_id INTEGER NOT NULL,
+    type INTEGER NOT NULL,
+    PRIMARY KEY(node_id),
+    FOREIGN KEY(node_id) REFERENCES node(id) ON DELETE CASCADE
+);"""
+
+_SQL_COMPONENT_ACCESS_INSERT = """
+INSERT INTO component_access(node_id, type) VALUES(?, ?);"""
+
+_SQL_COMPONENT_ACCESS_DROP = """
+DROP TABLE IF EXISTS component_access;"""
+
+_SQL_COMPONENT_ACCESS_DELETE = """
+DELETE FROM component_access WHERE node_id = ?;"""
 
-        result = list()
-        for row in rows:
-            result.append(Occurrence(*row))
+_SQL_COMPONENT_ACCESS_DELETE_MANY = """
+DELETE FROM component_access WHERE node_id IN (SELECT value FROM json_each(?));"""
 
-        return result
+_SQL_COMPONENT_ACCESS_CLEAR = """
+DELETE FROM component_access;"""
 
+_SQL_COMPONENT_ACCESS_COUNT = """
+SELECT COUNT(*) FROM component_access;"""
 
-class ComponentAccessDAO(object):
+_SQL_COMPONENT_ACCESS_GET = """
+SELECT node_id, type FROM component_access WHERE node_id = ?;"""
+
+_SQL_COMPONENT_ACCESS_UPDATE = """
+UPDATE component_access SET
+    type = ?
+WHERE
+    node_id = ?;"""
+
+_SQL_COMPONENT_ACCESS_LIST = """
+SELECT node_id, type FROM component_access;"""
+
+
+class ComponentAccessDAO(TableDAO[ComponentAccess]):
     """
     This class is a static class that can manipulate ComponentAccess objects,
     inserting and removing them from a sqlite database.
     """
 
-    @staticmethod
-    def create_table(database: sqlite3.Connection) -> None:
-        """
-        Create the component_access table of the Sourcetrail database
-        if it doesn't exist.
-        :param database: A database handle
-        :return: None
-        """
-        SqliteHelper.exec(
-            database,
-            """    
-            CREATE TABLE component_access(
-                node_id INTEGER NOT NULL, 
-                type INTEGER NOT NULL, 
-                PRIMARY KEY(node_id), 
-                FOREIGN KEY(node_id) REFERENCES node(id) ON DELETE CASCADE
-            );""",
-        )
+    _SQL_CREATE = _SQL_COMPONENT_ACCESS_CREATE
+    _SQL_DROP = _SQL_COMPONENT_ACCESS_DROP
+    _SQL_INSERT = _SQL_COMPONENT_ACCESS_INSERT
+    _SQL_DELETE = _SQL_COMPONENT_ACCESS_DELETE
+    _SQL_DELETE_MANY = _SQL_COMPONENT_ACCESS_DELETE_MANY
+    _SQL_CLEAR = _SQL_COMPONENT_ACCESS_CLEAR
+    _SQL_COUNT = _SQL_COMPONENT_ACCESS_COUNT
+    _SQL_GET = _SQL_COMPONENT_ACCESS_GET
+    _SQL_UPDATE = _SQL_COMPONENT_ACCESS_UPDATE
+    _SQL_LIST = _SQL_COMPONENT_ACCESS_LIST
 
     @staticmethod
-    def delete_table(database: sqlite3.Connection) -> None:
-        """
-        Delete the component_access table of the Sourcetrail database
-        only if it exists.
-        :param database: A database handle
-        :return: None
-        """
-        SqliteHelper.exec(
-            database,
-            """
-            DROP TABLE IF EXISTS main.component_access;""",
-        )
+    def _to_row(obj: ComponentAccess) -> tuple:
+        return (obj.node_id, obj.type)
 
     @staticmethod
-    def new(database: sqlite3.Connection, obj: ComponentAccess) -> int:
-        """
-        Insert a new ComponentAccess inside the component_access table.
-        :param database: A database handle
-        :param obj: The object to insert
-        :return: The id of the inserted component_access
-        """
-        return SqliteHelper.exec(
-            database,
-            """
-            INSERT INTO component_access(
-                node_id, type 
-            ) VALUES(?, ?);""",
-            (obj.node_id, obj.type.value),
-        )
+    def _from_row(row: tuple) -> ComponentAccess:
+        node_id, type_ = row
+        return ComponentAccess(node_id, _COMPONENT_ACCESS_TYPES[type_])
 
-    @staticmethod
-    def delete(database: sqlite3.Connection, obj: ComponentAccess) -> None:
-        """
-        Delete an ComponentAccess from the component_access table.
-        :param database: A database handle
-        :param obj: The object to delete
-        :return: None
-        """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM component_access WHERE node_id = ?;""",
-            (obj.node_id,),
-        )
 
-    @staticmethod
-    def clear(database: sqlite3.Connection) -> None:
-        """
-        Delete all ComponentAccess from the component_access table.
-        :param database: A database handle
-        :return: None
-        """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM component_access;""",
-        )
+_SQL_ERROR_CREATE = """
+CREATE TABLE error(
+    id INTEGER NOT NULL,
+    message TEXT,
+    fatal INTEGER NOT NULL,
+    indexed INTEGER NOT NULL,
+    translation_unit TEXT,
+    PRIMARY KEY(id),
+    FOREIGN KEY(id) REFERENCES element(id) ON DELETE CASCADE
+);"""
 
-    @staticmethod
-    def get(database: sqlite3.Connection, elem_id: int) -> ComponentAccess:
-        """
-        Return a component_access from the database with the matching id
-        :param database: A database handle
-        :param elem_id: The id of the component_access to retrieve
-        :return: A ComponentAccess object that reflect the content inside
-        the database
-        """
-        out = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM component_access WHERE node_id = ?;""",
-            (elem_id,),
-        )
+_SQL_ERROR_DROP = """
+DROP TABLE IF EXISTS error;"""
 
-        if len(out) == 1:
-            node_id, type_ = out[0]
-            return ComponentAccess(node_id, ComponentAccessType(type_))
+_SQL_ERROR_INSERT = """
+INSERT INTO error(
+    id, message, fatal, indexed, translation_unit
+) VALUES(?, ?, ?, ?, ?);"""
 
-    @staticmethod
-    def update(database: sqlite3.Connection, obj: ComponentAccess) -> None:
-        """
-        Update an ComponentAccess inside the component_access table.
-        :param database: A database handle
-        :param obj: The ComponentAccess object to update
-        :return: None
-        """
-        SqliteHelper.exec(
-            database,
-            """
-            UPDATE component_access SET
-                type = ? 
-            WHERE
-                node_id = ?;""",
-            (obj.type.value, obj.node_id),
-        )
+_SQL_ERROR_UPSERT = """
+INSERT INTO error(
+    id, message, fatal, indexed, translation_unit
+) VALUES(?, ?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET
+    message = excluded.message,
+    fatal = excluded.fatal,
+    indexed = excluded.indexed,
+    translation_unit = excluded.translation_unit;"""
 
-    @staticmethod
-    def list(database: sqlite3.Connection) -> list[ComponentAccess]:
-        """
-        Return the list of all the component_access from the component_access table.
-        :param database: A database handle
-        :return: The list of ComponentAccess
-        """
-        rows = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM component_access;""",
-        )
+_SQL_ERROR_DELETE = """
+DELETE FROM error WHERE id = ?;"""
 
-        result = list()
-        for row in rows:
-            node_id, type_ = row
-            result.append(ComponentAccess(node_id, ComponentAccessType(type_)))
+_SQL_ERROR_DELETE_MANY = """
+DELETE FROM error WHERE id IN (SELECT value FROM json_each(?));"""
 
-        return result
+_SQL_ERROR_GET = """
+SELECT id, message, fatal, indexed, translation_unit FROM error WHERE id = ?;"""
 
+_SQL_ERROR_CLEAR = """
+DELETE FROM error;"""
 
-class ErrorDAO(object):
+_SQL_ERROR_COUNT = """
+SELECT COUNT(*) FROM error;"""
+
+_SQL_ERROR_UPDATE = """
+UPDATE error SET
+    message = ?,
+    fatal = ?,
+    indexed = ?,
+    translation_unit = ?
+WHERE
+    id = ?;"""
+
+_SQL_ERROR_LIST = """
+SELECT id, message, fatal, indexed, translation_unit FROM error;"""
+
+
+class ErrorDAO(TableDAO[Error]):
     """
     This class is a static class that can manipulate Error objects,
     inserting and removing them from a sqlite database.
     """
 
-    @staticmethod
-    def create_table(database: sqlite3.Connection) -> None:
-        """
-        Create the error table of the Sourcetrail database
-        if it doesn't exist.
-        :param database: A database handle
-        :return: None
-        """
-        SqliteHelper.exec(
-            database,
-            """    
-            CREATE TABLE error(
-                id INTEGER NOT NULL, 
-                message TEXT, 
-                fatal INTEGER NOT NULL, 
-                indexed INTEGER NOT NULL, 
-                translation_unit TEXT, 
-                PRIMARY KEY(id), 
-                FOREIGN KEY(id) REFERENCES element(id) ON DELETE CASCADE
-            );""",
-        )
+    _SQL_CREATE = _SQL_ERROR_CREATE
+    _SQL_DROP = _SQL_ERROR_DROP
+    _SQL_INSERT = _SQL_ERROR_INSERT
+    _SQL_DELETE = _SQL_ERROR_DELETE
+    _SQL_DELETE_MANY = _SQL_ERROR_DELETE_MANY
+    _SQL_CLEAR = _SQL_ERROR_CLEAR
+    _SQL_COUNT = _SQL_ERROR_COUNT
+    _SQL_GET = _SQL_ERROR_GET
+    _SQL_UPDATE = _SQL_ERROR_UPDATE
+    _SQL_LIST = _SQL_ERROR_LIST
 
     @staticmethod
-    def delete_table(database: sqlite3.Connection) -> None:
-        """
-        Delete the error table of the Sourcetrail database
-        only if it exists.
-        :param database: A database handle
-        :return: None
-        """
-        SqliteHelper.exec(
-            database,
-            """
-            DROP TABLE IF EXISTS main.error;""",
-        )
+    def _to_row(obj: Error) -> tuple:
+        return (obj.id, obj.message, obj.fatal, obj.indexed, obj.translation_unit)
 
     @staticmethod
-    def new(database: sqlite3.Connection, obj: Error) -> int:
-        """
-        Insert a new Error inside the error table.
-        :param database: A database handle
-        :param obj: The object to insert
-        :return: The id of the inserted error
-        """
-        return SqliteHelper.exec(
-            database,
-            """
-            INSERT INTO error(
-                id, message, fatal, indexed, translation_unit 
-            ) VALUES(?, ?, ?, ?, ?);""",
-            (obj.id, obj.message, obj.fatal, obj.indexed, obj.translation_unit),
-        )
+    def _from_row(row: tuple) -> Error:
+        return Error(*row)
 
-    @staticmethod
-    def delete(database: sqlite3.Connection, obj: Error) -> None:
+    @classmethod
+    def upsert(cls, database: sqlite3.Connection, obj: Error) -> None:
         """
-        Delete an Error from the error table.
+        Insert an Error inside the error table, or update the error
+        already stored with the same id, with a single request.
         :param database: A database handle
-        :param obj: The object to delete
+        :param obj: The object to insert or update
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM error WHERE id = ?;""",
-            (obj.id,),
-        )
+        SqliteHelper.exec(database, _SQL_ERROR_UPSERT, cls._to_row(obj))
 
-    @staticmethod
-    def get(database: sqlite3.Connection, elem_id: int) -> Error:
-        """
-        Return an error from the database with the matching id
-        :param database: A database handle
-        :param elem_id: The id of the error to retrieve
-        :return: A Error object that reflect the content inside
-        the database
-        """
-        out = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM error WHERE id = ?;""",
-            (elem_id,),
-        )
 
-        if len(out) == 1:
-            return Error(*out[0])
+_SQL_META_CREATE = """
+CREATE TABLE meta(
+    id INTEGER,
+    key TEXT,
+    value TEXT,
+    PRIMARY KEY(id)
+);"""
 
-    @staticmethod
-    def clear(database: sqlite3.Connection) -> None:
-        """
-        Delete all Errors from the error table.
-        :param database: A database handle
-        :return: None
-        """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM error;""",
-        )
+_SQL_META_DROP = """
+DROP TABLE IF EXISTS meta;"""
 
-    @staticmethod
-    def update(database: sqlite3.Connection, obj: Error) -> None:
-        """
-        Update an Error inside the error table.
-        :param database: A database handle
-        :param obj: The Error object to update
-        :return: None
-        """
-        SqliteHelper.exec(
-            database,
-            """
-            UPDATE error SET
-                message = ?,
-                fatal = ?,
-                indexed = ?,
-                translation_unit = ?
-            WHERE
-                id = ?;""",
-            (obj.message, obj.fatal, obj.indexed, obj.translation_unit, obj.id),
-        )
+_SQL_META_INSERT = """
+INSERT INTO meta(
+    id, key, value
+) VALUES(NULL, ?, ?);"""
 
-    @staticmethod
-    def list(database: sqlite3.Connection) -> list[Error]:
-        """
-        Return the list of all the errors from the error table.
-        :param database: A database handle
-        :return: The list of Errors
-        """
-        rows = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM error;""",
-        )
+# The id of the row holding the key is looked up inside the request: when
+# there is none, the NULL id makes sqlite allocate a new one
+_SQL_META_UPSERT = """
+INSERT INTO meta(
+    id, key, value
+) VALUES((SELECT id FROM meta WHERE key = ? LIMIT 1), ?, ?) ON CONFLICT(id) DO UPDATE SET
+    value = excluded.value;"""
+
+_SQL_META_DELETE = """
+DELETE FROM meta WHERE id = ?;"""
+
+_SQL_META_DELETE_MANY = """
+DELETE FROM meta WHERE id IN (SELECT value FROM json_each(?));"""
+
+_SQL_META_GET = """
+SELECT id, key, value FROM meta WHERE id = ?;"""
+
+_SQL_META_CLEAR = """
+DELETE FROM meta;"""
 
-        result = list()
-        for row in rows:
-            result.append(Error(*row))
+_SQL_META_COUNT = """
+SELECT COUNT(*) FROM meta;"""
 
-        return result
+_SQL_META_UPDATE = """
+UPDATE meta SET
+    key = ?,
+    value = ?
+WHERE
+    id = ?;"""
+
+_SQL_META_LIST = """
+SELECT id, key, value FROM meta;"""
 
 
 class MetaDAO(object):
@@ -2167,16 +3124,7 @@ class MetaDAO(object):
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """    
-            CREATE TABLE meta(
-                id INTEGER, 
-                key TEXT, 
-                value TEXT, 
-                PRIMARY KEY(id)
-            );""",
-        )
+        SqliteHelper.exec(database, _SQL_META_CREATE)
 
     @staticmethod
     def delete_table(database: sqlite3.Connection) -> None:
@@ -2186,11 +3134,7 @@ class MetaDAO(object):
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DROP TABLE IF EXISTS main.meta;""",
-        )
+        SqliteHelper.exec(database, _SQL_META_DROP)
 
     @staticmethod
     def new(database: sqlite3.Connection, key: str, value: str) -> int:
@@ -2201,14 +3145,29 @@ class MetaDAO(object):
         :param value: The value to insert
         :return: The id of the inserted meta
         """
-        return SqliteHelper.exec(
-            database,
-            """
-            INSERT INTO meta(
-                id, key, value  
-            ) VALUES(NULL, ?, ?);""",
-            (key, value),
-        )
+        return SqliteHelper.exec(database, _SQL_META_INSERT, (key, value))
+
+    @staticmethod
+    def new_many(database: sqlite3.Connection, items: Iterable[tuple[str, str]]) -> int:
+        """
+        Insert many Metas inside the meta table with a single request.
+        :param database: A database handle
+        :param items: The key, value pairs to insert
+        :return: The number of inserted metas
+        """
+        return SqliteHelper.exec_many(database, _SQL_META_INSERT, items)
+
+    @staticmethod
+    def upsert(database: sqlite3.Connection, key: str, value: str) -> None:
+        """
+        Set the value of a Meta inside the meta table with a single
+        request, inserting it if the key is not there yet.
+        :param database: A database handle
+        :param key: The key to set
+        :param value: The value to set
+        :return: None
+        """
+        SqliteHelper.exec(database, _SQL_META_UPSERT, (key, key, value))
 
     @staticmethod
     def delete(database: sqlite3.Connection, id_: int) -> None:
@@ -2218,12 +3177,18 @@ class MetaDAO(object):
         :param id_: The identifier of the object to delete
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM meta WHERE id = ?;""",
-            (id_,),
-        )
+        SqliteHelper.exec(database, _SQL_META_DELETE, (id_,))
+
+    @staticmethod
+    def delete_many(database: sqlite3.Connection, ids: Iterable[int]) -> None:
+        """
+        Delete the Metas matching the given ids from the meta table with a
+        single request, whatever the number of ids.
+        :param database: A database handle
+        :param ids: The identifiers of the metas to delete
+        :return: None
+        """
+        SqliteHelper.exec(database, _SQL_META_DELETE_MANY, (json.dumps(list(ids)),))
 
     @staticmethod
     def get(database: sqlite3.Connection, id_: int) -> tuple[int, str, str]:
@@ -2234,13 +3199,7 @@ class MetaDAO(object):
         :return: A Meta object that reflect the content inside
         the database
         """
-        out = SqliteHelper.fetch(
-            database,
-            """
-            SELECT id, key, value FROM meta WHERE id = ?;""",
-            (id_,),
-        )
-        return tuple(out[0])
+        return SqliteHelper.fetch_one(database, _SQL_META_GET, (id_,))
 
     @staticmethod
     def clear(database: sqlite3.Connection) -> None:
@@ -2249,11 +3208,18 @@ class MetaDAO(object):
         :param database: A database handle
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            DELETE FROM meta;""",
-        )
+        SqliteHelper.exec(database, _SQL_META_CLEAR)
+
+    @staticmethod
+    def count(database: sqlite3.Connection) -> int:
+        """
+        Return the number of Metas in the meta table, counted by sqlite without reading
+        the rows into Python objects. sqlite doesn't keep the count, so
+        it still walks the whole table.
+        :param database: A database handle
+        :return: The number of Metas
+        """
+        return SqliteHelper.fetch_one(database, _SQL_META_COUNT)[0]
 
     @staticmethod
     def update(database: sqlite3.Connection, id_: int, key: str, value: str) -> None:
@@ -2265,16 +3231,19 @@ class MetaDAO(object):
         :param value: The value to insert
         :return: None
         """
-        SqliteHelper.exec(
-            database,
-            """
-            UPDATE meta SET
-                key = ?,
-                value = ?
-            WHERE
-                id = ?;""",
-            (key, value, id_),
-        )
+        SqliteHelper.exec(database, _SQL_META_UPDATE, (key, value, id_))
+
+    @staticmethod
+    def iter(database: sqlite3.Connection) -> Iterator[tuple[int, str, str]]:
+        """
+        Iterate over all the metas from the meta table.
+        The rows are read from the database as the iteration goes, so
+        the whole table is never held in memory.
+        :param database: A database handle
+        :return: An iterator over the Metas
+        """
+        for rows in SqliteHelper.fetch_batches(database, _SQL_META_LIST):
+            yield from rows
 
     @staticmethod
     def list(database: sqlite3.Connection) -> list[tuple[int, str, str]]:
@@ -2283,14 +3252,31 @@ class MetaDAO(object):
         :param database: A database handle
         :return: The list of Metas
         """
-        rows = SqliteHelper.fetch(
-            database,
-            """
-            SELECT * FROM meta;""",
-        )
-
-        result = list()
-        for row in rows:
-            result.append(tuple(row))
-
-        return result
+        return SqliteHelper.fetch(database, _SQL_META_LIST)
+
+
+# Complete schema of the Sourcetrail database, in creation order
+_SQL_SCHEMA = "\n".join(
+    (
+        _SQL_ELEMENT_CREATE,
+        _SQL_ELEMENT_COMPONENT_CREATE,
+        _SQL_ELEMENT_COMPONENT_INDEX,
+        _SQL_EDGE_CREATE,
+        _SQL_EDGE_INDEX_SOURCE,
+        _SQL_EDGE_INDEX_TARGET,
+        _SQL_NODE_CREATE,
+        _SQL_NODE_TYPE_CREATE,
+        _SQL_NODE_TYPE_INIT,
+        _SQL_SYMBOL_CREATE,
+        _SQL_FILE_CREATE,
+        _SQL_FILE_CONTENT_CREATE,
+        _SQL_NODE_FILE_CREATE,
+        _SQL_LOCAL_SYMBOL_CREATE,
+        _SQL_LOCAL_SYMBOL_INDEX,
+        _SQL_SOURCE_LOCATION_CREATE,
+        _SQL_OCCURRENCE_CREATE,
+        _SQL_COMPONENT_ACCESS_CREATE,
+        _SQL_ERROR_CREATE,
+        _SQL_META_CREATE,
+    )
+)
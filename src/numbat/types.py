@@ -23,6 +23,22 @@ from .exceptions import SerializeException, DeserializeException
 # Basic wrapper Types for API                                              #
 # ------------------------------------------------------------------------ #
 
+class _StoredEnum(enum.IntEnum):
+    """
+        Base class of the enums stored in the database. Their members are
+        integers so they can be bound to requests as they are, but they
+        are printed and formatted by name like the members of a plain
+        Enum, e.g. str(NodeType.NODE_CLASS) is 'NodeType.NODE_CLASS'.
+    """
+
+    __str__ = enum.Enum.__str__
+
+    def __format__(self, format_spec: str) -> str:
+        # Not enum.Enum.__format__, which formats the value of int based
+        # enums before Python 3.11
+        return format(str(self), format_spec)
+
+
 class Element(object):
     """
         Wrapper class for sourcetrail 'element' table:
@@ -40,6 +56,8 @@ class Element(object):
         any element by removing the correct entry in the 'element' table.
     """
 
+    __slots__ = ('id',)
+
     def __init__(self, id_: int = 0):
         """
             Create a new Element object. 
@@ -49,7 +67,7 @@ class Element(object):
         self.id = id_
 
 
-class ElementComponentType(enum.Enum):
+class ElementComponentType(_StoredEnum):
     """
         Internal class that represent an ElementComponent type 
         inside the sourcetrail database. This type is used to 
@@ -79,6 +97,8 @@ class ElementComponent(Element):
         ambiguity of another element such as an edge or a node.
     """
 
+    __slots__ = ('elem_id', 'type', 'data')
+
     def __init__(self, id_: int = 0, elem_id: int = 0,
                  type_: ElementComponentType = ElementComponentType.NONE,
                  data: str = ''):
@@ -96,7 +116,7 @@ class ElementComponent(Element):
         self.data = data
 
 
-class EdgeType(enum.Enum):
+class EdgeType(_StoredEnum):
     """
         Internal class that represent an Edge type inside the
         sourcetrail database. This type define the relationship
@@ -142,6 +162,8 @@ class Edge(Element):
         of a class or a function foo is calling another function bar.
     """
 
+    __slots__ = ('type', 'src', 'dst', 'hover_display')
+
     def __init__(self, id_: int = 0, type_: EdgeType = EdgeType.UNDEFINED,
                  src: int = 0, dst: int = 0, hover_display: str = ''):
         """
@@ -160,7 +182,7 @@ class Edge(Element):
         self.hover_display = hover_display
 
 
-class NodeType(enum.Enum):
+class NodeType(_StoredEnum):
     """
         Internal class that represent an Edge type inside the
         sourcetrail database. This type define the type of the
@@ -221,6 +243,8 @@ class Node(Element):
         hold some information about his parent 'A' (id1).
     """
 
+    __slots__ = ('type', 'name', 'hover_display')
+
     def __init__(self, id_: int = 0, type_: NodeType = NodeType.NODE_TYPE,
                  name: str = '', hover_display: str = ''):
         """
@@ -253,6 +277,8 @@ class NodeDisplay():
         The 'node_type' table is used to store how each type of node is displayed.
     """
 
+    __slots__ = ('id', 'graph_display', 'hover_display')
+
     def __init__(self, id: NodeType, graph_display: str, hover_display: str):
         """
             Create a new NodeDisplay object.
@@ -265,7 +291,7 @@ class NodeDisplay():
         self.hover_display = hover_display
 
 
-class SymbolType(enum.Enum):
+class SymbolType(_StoredEnum):
     """
         Internal class that represent a Symbol type inside the 
         sourcetrail database. This type define the symbol type in the database.
@@ -292,6 +318,8 @@ class Symbol(Element):
         such as node.  
     """
 
+    __slots__ = ('definition_kind',)
+
     def __init__(self, id_: int = 0, definition: SymbolType = SymbolType.NONE):
         """
             Create a new Symbol object. 
@@ -326,6 +354,8 @@ class File(Element):
         will be reference by the element of the 'filecontent' table.
     """
 
+    __slots__ = ('path', 'language', 'modification_time', 'indexed', 'complete', 'line_count')
+
     def __init__(self, id_: int = 0, path: str = '', language: str = '',
                  modification_time: str = '', indexed: int = 0, complete: int = 0,
                  line_count: int = 0):
@@ -368,6 +398,8 @@ class FileContent(Element):
         a filecontent should contain the entire content of a file.
     """
 
+    __slots__ = ('content',)
+
     def __init__(self, id_: int = 0, content: str = ''):
         """
             Create a new FileContent object.
@@ -398,6 +430,8 @@ class NodeFile(Element):
         and the node they are associated to.
     """
 
+    __slots__ = ('file_name', 'display_content')
+
     def __init__(self, file_id: int, file_name: str, display_content: bool):
         """
             Create a new NodeFile object.
@@ -443,6 +477,8 @@ class LocalSymbol(Element):
         detail to the user when browsing code in Sourcetrail UI.
     """
 
+    __slots__ = ('name',)
+
     def __init__(self, id_: int = 0, name: str = ''):
         """
             Create a new LocalSymbol object.
@@ -455,7 +491,7 @@ class LocalSymbol(Element):
         self.name = name
 
 
-class SourceLocationType(enum.Enum):
+class SourceLocationType(_StoredEnum):
     """
         Internal class that represent a SymbolLocation type inside the 
         sourcetrail database. This type define the symbol location type in the
@@ -496,6 +532,8 @@ class SourceLocation(Element):
         located in the source tree.
     """
 
+    __slots__ = ('file_node_id', 'start_line', 'start_column', 'end_line', 'end_column', 'type')
+
     def __init__(self, id_: int = 0, file_node_id: int = 0, start_line: int = 0,
                  start_column: int = 0, end_line: int = 0, end_column: int = 0,
                  type_: SourceLocationType = SourceLocationType.UNSOLVED):
@@ -539,6 +577,8 @@ class Occurrence(object):
         table and the ones define in the 'node' table. 
     """
 
+    __slots__ = ('element_id', 'source_location_id')
+
     def __init__(self, elem_id: int = 0, source_location_id: int = 0):
         """
             Create a new Occurrence object.
@@ -551,7 +591,7 @@ class Occurrence(object):
         self.source_location_id = source_location_id
 
 
-class ComponentAccessType(enum.Enum):
+class ComponentAccessType(_StoredEnum):
     """
         Internal class that represent a ComponentAccess type inside 
         the sourcetrail database. This type define the type of 
@@ -586,6 +626,8 @@ class ComponentAccess(object):
         class that is set to public will have an entry in this table.
     """
 
+    __slots__ = ('node_id', 'type')
+
     def __init__(self, node_id: int = 0,
                  type_: ComponentAccessType = ComponentAccessType.NONE):
         """
@@ -619,6 +661,8 @@ class Error(Element):
         the parsing of the source files and are displayed in the UI. 
     """
 
+    __slots__ = ('message', 'fatal', 'indexed', 'translation_unit')
+
     def __init__(self, id_: int = 0, message: str = '', fatal: int = 0,
                  indexed: int = 0, translation_unit: str = ''):
         """
@@ -784,21 +828,18 @@ class NameHierarchy(object):
             :param end: the ending position of the elements  
             :return: The serialized name 
         """
-        result = self._delimiter + self.META_DELIMITER
         if not self._elements:
             # @Warning: This is not the same behavior as SourcetrailDB
             # We are returning an exception instead of an empty string
             raise SerializeException()
 
-        elements = self._elements[start:end]
-        for i, elem in enumerate(elements):
-            if i > 0:
-                result += self.NAME_DELIMITER
-
-            result += elem.get_name() + self.PART_DELIMITER
-            result += elem.get_prefix() + self.SIGNATURE_DELIMITER
-            result += elem.get_postfix()
-        return result
+        # Build each element at once and join them in a single pass rather
+        # than growing the result string piece by piece
+        part, signature = self.PART_DELIMITER, self.SIGNATURE_DELIMITER
+        return self._delimiter + self.META_DELIMITER + self.NAME_DELIMITER.join(
+            elem.get_name() + part + elem.get_prefix() + signature + elem.get_postfix()
+            for elem in self._elements[start:end]
+        )
 
     def extend(self, element: NameElement) -> None:
         """
@@ -826,6 +867,29 @@ class NameHierarchy(object):
         """
         return self.__serialize(0, self.size())
 
+    def serialize_prefixes(self) -> list[str]:
+        """
+            Utility method that return the serialized names of all the
+            prefixes of the hierarchy, from the first element alone to the
+            full name. Each one extends the previous one, so the elements
+            are only serialized once instead of once per prefix.
+
+            :return: The list of the serialized names
+        """
+        if not self._elements:
+            # @Warning: This is not the same behavior as SourcetrailDB
+            # We are returning an exception instead of an empty string
+            raise SerializeException()
+
+        part, signature = self.PART_DELIMITER, self.SIGNATURE_DELIMITER
+        serialized = self._delimiter + self.META_DELIMITER
+        prefixes = []
+        for elem in self._elements:
+            serialized += elem.get_name() + part + elem.get_prefix() + signature + elem.get_postfix()
+            prefixes.append(serialized)
+            serialized += self.NAME_DELIMITER
+        return prefixes
+
     def size(self) -> int:
         """
             Return the size of the NameHierarchy object.
@@ -850,8 +914,8 @@ class NameHierarchy(object):
             the delimiter "DELIMITER".
             :return: The NameHierarchy corresponding to the deserialize_name 
         """
-        idx = serialized_name.find(NameHierarchy.META_DELIMITER)
-        if idx == -1:
+        delimiter, found, body = serialized_name.partition(NameHierarchy.META_DELIMITER)
+        if not found:
             # Invalid meta delimiter
 
             # @Warning: This is not the same behavior as SourcetrailDB
@@ -859,14 +923,13 @@ class NameHierarchy(object):
             # return NameHierarchy(NameHierarchy.NAME_DELIMITER_UNKNOWN, None)
             raise DeserializeException()
 
+        # The elements are split out by str methods, running in C, instead of
+        # walking the string with successive finds
         elements = list()
-        result = NameHierarchy(serialized_name[0: idx], None)
-
-        idx += len(NameHierarchy.META_DELIMITER)
-        while idx < len(serialized_name):
+        for part in body.split(NameHierarchy.NAME_DELIMITER) if body else ():
             # Read name
-            spos = serialized_name.find(NameHierarchy.PART_DELIMITER, idx)
-            if spos == -1:
+            name, found, part = part.partition(NameHierarchy.PART_DELIMITER)
+            if not found:
                 # Invalid part delimiter
 
                 # @Warning: This is not the same behavior as SourcetrailDB
@@ -874,12 +937,9 @@ class NameHierarchy(object):
                 # return NameHierarchy(NameHierarchy.NAME_DELIMITER_UNKNOWN, None)
                 raise DeserializeException()
 
-            name = serialized_name[idx: spos]
-            spos += len(NameHierarchy.PART_DELIMITER)
-
-            # Read prefix
-            ppos = serialized_name.find(NameHierarchy.SIGNATURE_DELIMITER, spos)
-            if ppos == -1:
+            # Read prefix and postfix
+            prefix, found, postfix = part.partition(NameHierarchy.SIGNATURE_DELIMITER)
+            if not found:
                 # Invalid signature delimiter
 
                 # @Warning: This is not the same behavior as SourcetrailDB
@@ -887,19 +947,6 @@ class NameHierarchy(object):
                 # return NameHierarchy(NameHierarchy.NAME_DELIMITER_UNKNOWN, None)
                 raise DeserializeException()
 
-            prefix = serialized_name[spos: ppos]
-            ppos += len(NameHierarchy.SIGNATURE_DELIMITER)
-
-            # Read postfix
-            npos = serialized_name.find(NameHierarchy.NAME_DELIMITER, ppos)
-            if npos == -1:
-                postfix = serialized_name[ppos:]
-                idx = len(serialized_name)
-            else:
-                postfix = serialized_name[ppos: npos]
-                idx = npos + len(NameHierarchy.NAME_DELIMITER)
-
             elements.append(NameElement(prefix, name, postfix))
 
-        result._elements = elements
-        return result
+        return NameHierarchy(delimiter, elements)
@@ -1,10 +1,19 @@
 from numbat import SourcetrailDB
-from numbat.types import NameHierarchy
+from numbat.db import (
+    EdgeDAO, ElementDAO, ErrorDAO, FileDAO, MetaDAO, NodeDAO, OccurrenceDAO, SourceLocationDAO, SqliteHelper,
+    SqlitePool, TableDAO,
+)
+from numbat.types import (
+    EdgeType, Element, Error, NameHierarchy, NodeType, Occurrence, SourceLocation, SourceLocationType,
+)
 
+import numbat.db
 import pathlib
 import shutil
+import sqlite3
 import pytest
 import os
+import threading
 
 TMP_PATH = 'generated'
 
@@ -102,3 +111,375 @@ def test_duplicate_symbol(test_create_db):
     assert(id_a == id_b)
 
     srctrl.close()
+
+def test_edge_list_soa(test_create_db):
+    path = '%s/db.srctrldb' % TMP_PATH
+
+    srctrl = SourcetrailDB.open(path)
+    parent = srctrl.record_class(name='Parent')
+    child = srctrl.record_method(name='child', parent_id=parent)
+
+    ids, types, sources, targets = EdgeDAO.list_soa(srctrl.database)
+    assert len(ids) == len(types) == len(sources) == len(targets) == 1
+    assert types[0] == EdgeType.MEMBER.value
+    assert (sources[0], targets[0]) == (parent, child)
+    assert [edge.dst for edge in EdgeDAO.list_by_source(srctrl.database, parent)] == [child]
+    assert [edge.src for edge in EdgeDAO.list_by_target(srctrl.database, child)] == [parent]
+    assert EdgeDAO.list_by_source(srctrl.database, child) == []
+
+    assert list(EdgeDAO.get_many(srctrl.database, [ids[0], -1])) == [ids[0]]
+    assert sorted(NodeDAO.get_many(srctrl.database, [parent, child, -1])) == sorted([parent, child])
+
+    EdgeDAO.delete_many(srctrl.database, ids)
+    assert EdgeDAO.list(srctrl.database) == []
+
+    srctrl.close()
+
+def test_pool_threads(test_create_db):
+    path = '%s/db.srctrldb' % TMP_PATH
+
+    pool = SqlitePool(path, size=2)
+    with pool.writer() as database:
+        MetaDAO.new(database, 'pool', 'test')
+
+    counts = []
+
+    def read():
+        counts.append(len(MetaDAO.list(pool.get())))
+        pool.release()
+        with pool.acquire() as database:
+            counts.append(len(MetaDAO.list(database)))
+
+    with pool.acquire() as database:
+        with pytest.raises(sqlite3.OperationalError):
+            MetaDAO.new(database, 'reader', 'test')
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counts == [3] * 8
+    pool.close()
+
+def test_transaction_rollback(test_create_db):
+    path = '%s/db.srctrldb' % TMP_PATH
+    srctrl = SourcetrailDB.open(path)
+    srctrl.commit()
+
+    with SqliteHelper.transaction(srctrl.database):
+        MetaDAO.new(srctrl.database, 'kept', 'test')
+        with pytest.raises(ValueError):
+            with SqliteHelper.transaction(srctrl.database):
+                MetaDAO.new(srctrl.database, 'dropped', 'test')
+                raise ValueError()
+
+    assert not srctrl.database.in_transaction
+    assert [key for _, key, _ in MetaDAO.list(srctrl.database)][2:] == ['kept']
+
+    with pytest.raises(ValueError):
+        with srctrl.transaction():
+            srctrl.record_class(name='Dropped')
+            raise ValueError()
+
+    assert not srctrl.database.in_transaction
+    assert srctrl.name_cache is None
+    assert srctrl.record_class(name='Dropped') is not None
+
+    srctrl.close()
+
+def test_table_dao(test_create_db):
+    path = '%s/db.srctrldb' % TMP_PATH
+    srctrl = SourcetrailDB.open(path)
+
+    loc = SourceLocation(0, 1, 2, 3, 4, 5, SourceLocationType.TOKEN)
+    loc.id = SourceLocationDAO.new(srctrl.database, loc)
+    loc.end_line = 10
+    SourceLocationDAO.update(srctrl.database, loc)
+
+    copy = SourceLocationDAO.get(srctrl.database, loc.id)
+    assert (copy.end_line, copy.type) == (10, SourceLocationType.TOKEN)
+    assert [l.id for l in SourceLocationDAO.list(srctrl.database)] == [loc.id]
+
+    SourceLocationDAO.delete(srctrl.database, loc)
+    assert SourceLocationDAO.get(srctrl.database, loc.id) is None
+    assert ErrorDAO.get(srctrl.database, -1) is None
+    assert MetaDAO.get(srctrl.database, -1) is None
+
+    srctrl.close()
+
+def test_bulk_mode(test_create_db):
+    path = '%s/db.srctrldb' % TMP_PATH
+    srctrl = SourcetrailDB.open(path)
+    indexes = "SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL ORDER BY name"
+    names = srctrl.database.execute(indexes).fetchall()
+
+    with SqliteHelper.bulk_mode(srctrl.database):
+        assert srctrl.database.execute(indexes).fetchall() == []
+        parent = srctrl.record_class(name='Parent')
+
+    assert srctrl.database.execute(indexes).fetchall() == names
+    assert len(names) == 4
+    assert parent is not None
+
+    SqliteHelper.finalize(srctrl.database)
+    assert srctrl.database.execute("SELECT count(*) FROM sqlite_stat1").fetchone()[0] > 0
+
+    srctrl.close()
+
+def test_transaction_commit(test_create_db):
+    path = '%s/db.srctrldb' % TMP_PATH
+    srctrl = SourcetrailDB.open(path)
+    srctrl.commit()
+    elements = len(ElementDAO.list(srctrl.database))
+
+    with SqliteHelper.transaction(srctrl.database):
+        assert ElementDAO.new_many(srctrl.database, (Element() for _ in range(3))) == 3
+        OccurrenceDAO.new_many(srctrl.database, (Occurrence(42, i) for i in range(3)))
+        OccurrenceDAO.delete_many(srctrl.database, (Occurrence(42, i) for i in range(2)))
+        ErrorDAO.new_many(srctrl.database, (Error(i, 'error', False, True, '') for i in range(1, 11)))
+        ErrorDAO.delete(srctrl.database, Error(10, '', False, True, ''))
+        ErrorDAO.delete_many(srctrl.database, [1, 2, 3, 42])
+        ErrorDAO.update_many(srctrl.database, (Error(i, 'updated', True, True, '') for i in range(4, 6)))
+
+    assert not srctrl.database.in_transaction
+    assert len(ElementDAO.list(srctrl.database)) == elements + 3
+    assert [occ.source_location_id for occ in OccurrenceDAO.list_by_element(srctrl.database, 42)] == [2]
+    assert [error.id for error in ErrorDAO.list(srctrl.database)] == list(range(4, 10))
+    assert ErrorDAO.count(srctrl.database) == 6
+    assert ErrorDAO.get(srctrl.database, 5).message == 'updated'
+    assert ErrorDAO.get(srctrl.database, 6).message == 'error'
+
+    srctrl.close()
+
+def test_upsert(test_create_db):
+    path = '%s/db.srctrldb' % TMP_PATH
+    srctrl = SourcetrailDB.open(path)
+
+    MetaDAO.upsert(srctrl.database, 'storage_version', '26')
+    MetaDAO.upsert(srctrl.database, 'upserted', 'test')
+    metas = {key: value for _, key, value in MetaDAO.list(srctrl.database)}
+    assert (metas['storage_version'], metas['upserted']) == ('26', 'test')
+    assert len(metas) == MetaDAO.count(srctrl.database)
+
+    ErrorDAO.upsert(srctrl.database, Error(1, 'error', False, True, ''))
+    ErrorDAO.upsert(srctrl.database, Error(1, 'upserted', False, True, ''))
+    assert [error.message for error in ErrorDAO.list(srctrl.database)] == ['upserted']
+
+    srctrl.close()
+
+def test_open_pragmas(test_create_db):
+    path = '%s/db.srctrldb' % TMP_PATH
+    srctrl = SourcetrailDB.open(path, journal_mode='DELETE', synchronous='FULL')
+
+    assert srctrl.database.execute('PRAGMA journal_mode').fetchone()[0] == 'delete'
+    assert srctrl.database.execute('PRAGMA synchronous').fetchone()[0] == 2
+
+    srctrl.close()
+
+def test_open_rejects_pragma_values(test_create_db):
+    path = '%s/db.srctrldb' % TMP_PATH
+
+    with pytest.raises(ValueError):
+        SourcetrailDB.open(path, synchronous='bogus')
+    with pytest.raises(ValueError):
+        SourcetrailDB.open(path, clear=True, journal_mode='bogus')
+    with pytest.raises(ValueError):
+        SourcetrailDB.create('%s/other.srctrldb' % TMP_PATH, journal_mode='bogus')
+
+    assert not pathlib.Path('%s/other.srctrldb' % TMP_PATH).exists()
+    assert pathlib.Path(path).exists()
+    srctrl = SourcetrailDB.open(path)
+    srctrl.close()
+
+def test_transaction_foreign_keys():
+    database = SqliteHelper.connect(':memory:')
+    database.executescript(
+        'PRAGMA foreign_keys=ON; CREATE TABLE parent(id INTEGER PRIMARY KEY);'
+        'CREATE TABLE child(id INTEGER PRIMARY KEY, parent_id INTEGER REFERENCES parent(id));'
+    )
+
+    with SqliteHelper.transaction(database):
+        database.execute('INSERT INTO child VALUES(1, 1)')
+        database.execute('INSERT INTO parent VALUES(1)')
+
+    with pytest.raises(sqlite3.IntegrityError):
+        with SqliteHelper.transaction(database):
+            database.execute('INSERT INTO child VALUES(2, 2)')
+
+    assert database.execute('SELECT id FROM child').fetchall() == [(1,)]
+    database.close()
+
+def test_reopen_name_cache(test_create_db):
+    path = '%s/db.srctrldb' % TMP_PATH
+    srctrl = SourcetrailDB.open(path)
+    parent = srctrl.record_class(name='Parent')
+    srctrl.commit()
+    nodes = len(NodeDAO.list(srctrl.database))
+    srctrl.close()
+
+    srctrl = SourcetrailDB.open(path)
+    assert srctrl.record_class(name='Parent') == parent
+    assert len(NodeDAO.list(srctrl.database)) == nodes
+    child = srctrl.record_method(name='child', parent_id=parent)
+    assert srctrl.node_names[parent] == NodeDAO.get(srctrl.database, parent).name
+    assert srctrl.record_method(name='child', parent_id=parent) == child
+
+    srctrl.close()
+
+def test_serialize_prefixes():
+    hierarchy = NameHierarchy.deserialize_name('::\tmns\ts\tp\tnA\tsclass\tp{}\tnm\ts\tp()')
+    prefixes = hierarchy.serialize_prefixes()
+
+    assert prefixes == [hierarchy.serialize_range(0, i + 1) for i in range(hierarchy.size())]
+    assert prefixes[-1] == hierarchy.serialize_name()
+
+def test_configure_rejects_pragma_values():
+    database = SqliteHelper.connect(':memory:')
+
+    with pytest.raises(ValueError):
+        SqliteHelper.configure(database, journal_mode='WAL; DROP TABLE node')
+    with pytest.raises(ValueError):
+        SqliteHelper.configure(database, synchronous='4')
+    SqliteHelper.configure(database, journal_mode='memory', synchronous=2)
+    assert database.execute('PRAGMA synchronous').fetchone()[0] == 2
+
+    database.close()
+
+def test_table_dao_requires_conversions():
+    with pytest.raises(TypeError):
+        class IncompleteDAO(TableDAO[Error]):
+            @staticmethod
+            def _to_row(obj):
+                return (obj.id,)
+
+def test_enum_str():
+    assert str(EdgeType.MEMBER) == 'EdgeType.MEMBER'
+    assert '%s %s' % (EdgeType.MEMBER, SourceLocationType.TOKEN) == 'EdgeType.MEMBER SourceLocationType.TOKEN'
+    assert f'{EdgeType.MEMBER}' == 'EdgeType.MEMBER'
+    assert EdgeType.MEMBER == EdgeType.MEMBER.value
+
+def test_close_when_optimize_fails(test_create_db, monkeypatch):
+    path = '%s/db.srctrldb' % TMP_PATH
+    srctrl = SourcetrailDB.open(path)
+    database = srctrl.database
+
+    def finalize(database, analyze=True):
+        raise sqlite3.OperationalError('database is locked')
+
+    monkeypatch.setattr(SqliteHelper, 'finalize', finalize)
+    srctrl.close()
+
+    assert srctrl.database is None
+    with pytest.raises(sqlite3.ProgrammingError):
+        database.execute('SELECT 1')
+
+def test_transaction_after_pending_changes(test_create_db):
+    path = '%s/db.srctrldb' % TMP_PATH
+    srctrl = SourcetrailDB.open(path)
+    nodes = len(NodeDAO.list(srctrl.database))
+
+    srctrl.record_class(name='Before')
+    with srctrl.transaction():
+        srctrl.record_class(name='Inside')
+        with srctrl.transaction():
+            srctrl.record_class(name='Nested')
+
+    assert not srctrl.database.in_transaction
+    srctrl.close()
+
+    srctrl = SourcetrailDB.open(path)
+    assert len(NodeDAO.list(srctrl.database)) == nodes + 3
+    srctrl.close()
+
+def test_source_location_without_returning(test_create_db, monkeypatch):
+    path = '%s/db.srctrldb' % TMP_PATH
+    srctrl = SourcetrailDB.open(path)
+    locs = [SourceLocation(0, 1, i, 1, i, 5, SourceLocationType.TOKEN) for i in range(3)]
+
+    if sqlite3.sqlite_version_info >= (3, 35, 0):
+        ids = SourceLocationDAO.new_many_ids(srctrl.database, locs)
+        assert [SourceLocationDAO.get(srctrl.database, id_).start_line for id_ in ids] == [0, 1, 2]
+
+    monkeypatch.setattr(numbat.db, '_HAS_RETURNING', False)
+    id_ = SourceLocationDAO.new(srctrl.database, locs[0])
+    assert SourceLocationDAO.get(srctrl.database, id_).start_line == 0
+    with pytest.raises(sqlite3.NotSupportedError):
+        SourceLocationDAO.new_many_ids(srctrl.database, locs)
+
+    srctrl.close()
+
+def test_occurrence_new_bulk(test_create_db):
+    path = '%s/db.srctrldb' % TMP_PATH
+    srctrl = SourcetrailDB.open(path)
+    srctrl.commit()
+    OccurrenceDAO.new(srctrl.database, Occurrence(1, 1))
+    srctrl.commit()
+
+    # Duplicates within the batch and an existing occurrence
+    assert OccurrenceDAO.new_bulk(srctrl.database, [(1, 1), (2, 1), (2, 1), (1, 2)]) == 2
+    assert not srctrl.database.in_transaction
+    assert OccurrenceDAO.new_bulk(srctrl.database, [(2, 1)]) == 0
+
+    # Within a pending transaction, only a savepoint is released
+    OccurrenceDAO.new(srctrl.database, Occurrence(3, 1))
+    assert OccurrenceDAO.new_bulk(srctrl.database, [(3, 2)]) == 1
+    assert srctrl.database.in_transaction
+    srctrl.database.rollback()
+
+    occurrences = [(o.element_id, o.source_location_id) for o in OccurrenceDAO.list(srctrl.database)]
+    assert sorted(occurrences) == [(1, 1), (1, 2), (2, 1)]
+
+    srctrl.close()
+
+def test_new_columns(test_create_db):
+    path = '%s/db.srctrldb' % TMP_PATH
+    srctrl = SourcetrailDB.open(path)
+    database = srctrl.database
+    ids = [ElementDAO.new(database, Element()) for _ in range(3)]
+
+    # Neither the element rows nor the hover_display are written
+    types = [NodeType.NODE_CLASS, NodeType.NODE_METHOD, NodeType.NODE_FILE]
+    assert NodeDAO.new_columns(database, ids, [t.value for t in types], ['a', 'b', 'c']) == 3
+    nodes = sorted(NodeDAO.list(database), key=lambda node: node.id)
+    assert [(n.id, n.type, n.name, n.hover_display) for n in nodes] == list(zip(ids, types, 'abc', [None] * 3))
+
+    edge_id = ElementDAO.new(database, Element())
+    assert EdgeDAO.new_columns(database, [edge_id], [EdgeType.MEMBER.value], [ids[0]], [ids[1]]) == 1
+    assert [(e.id, e.type, e.src, e.dst) for e in EdgeDAO.list(database)] == [
+        (edge_id, EdgeType.MEMBER, ids[0], ids[1])
+    ]
+
+    assert FileDAO.new_columns(database, [ids[2]], ['file.c'], ['c'], ['2024-01-01 00:00:00'], [True], [True], [3]) == 1
+    assert [(f.id, f.path, f.language, f.modification_time, f.indexed, f.complete, f.line_count)
+            for f in FileDAO.list(database)] == [(ids[2], 'file.c', 'c', '2024-01-01 00:00:00', 1, 1, 3)]
+
+    srctrl.close()
+
+def test_iter_batches(test_create_db):
+    path = '%s/db.srctrldb' % TMP_PATH
+    srctrl = SourcetrailDB.open(path)
+    database = srctrl.database
+
+    # More rows than a single batch of fetch_batches holds
+    count = 1500
+    locs = (SourceLocation(0, 1, i, 1, i, 2, SourceLocationType.TOKEN) for i in range(count))
+    SourceLocationDAO.new_many(database, locs)
+    ElementDAO.new_many(database, (Element() for _ in range(count)))
+    OccurrenceDAO.new_many(database, (Occurrence(i, i) for i in range(count)))
+
+    batches = SqliteHelper.fetch_batches(database, 'SELECT id FROM source_location')
+    assert [len(rows) for rows in batches] == [1024, count - 1024]
+    batches = SqliteHelper.fetch_batches(database, 'SELECT id FROM source_location', size=600)
+    assert [len(rows) for rows in batches] == [600, 600, count - 1200]
+
+    rows = list(map(SourceLocationDAO._to_row, SourceLocationDAO.iter(database)))
+    assert len(rows) == count
+    assert rows == list(map(SourceLocationDAO._to_row, SourceLocationDAO.list(database)))
+    assert [e.id for e in ElementDAO.iter(database)] == [e.id for e in ElementDAO.list(database)]
+    assert [(o.element_id, o.source_location_id) for o in OccurrenceDAO.iter(database)] == [
+        (o.element_id, o.source_location_id) for o in OccurrenceDAO.list(database)
+    ]
+
+    srctrl.close()